@@ -0,0 +1,92 @@
+"""benchmark: git status time against tree size and number of changed files.
+
+Run with python -m pre_commit_check.bench_git_status. The batched status
+refreshes and scans only the directories of the changed files (collapsed
+to common parents), so it follows the number of changed files; it still
+reads the whole index, a small cost growing with the tree. A plain git
+status refreshes and scans the whole tree.
+"""
+
+from contextlib import redirect_stdout
+import os
+import subprocess
+import tempfile
+import time
+
+from pre_commit_check.git_status import GitStatus, get_pathspecs
+
+TREE_SIZES = [1000, 10000, 50000]
+CHANGED = [1, 10, 100]
+FILES_PER_DIRECTORY = 100
+# directories per top-level part, like the chapters of a document
+DIRECTORIES_PER_PART = 10
+CHANGED_PER_DIRECTORY = 10
+
+
+def make_repo(directory: str, nr_of_files: int) -> list[str]:
+    """Commit nr_of_files files into a new repository in directory."""
+    subprocess.run(["git", "init", "-q", directory], check=True)
+    files = []
+    for index in range(nr_of_files):
+        directory_index = index // FILES_PER_DIRECTORY
+        subdirectory = os.path.join(
+            directory, f"p{directory_index // DIRECTORIES_PER_PART}",
+            f"d{directory_index}")
+        os.makedirs(subdirectory, exist_ok=True)
+        name = os.path.join(subdirectory, f"f{index}.tex")
+        with open(name, "w") as file_descriptor:
+            file_descriptor.write(f"{index}\n")
+        files.append(os.path.relpath(name, directory))
+    subprocess.run(["git", "add", "."], cwd=directory, check=True)
+    subprocess.run(["git", "-c", "user.name=bench", "-c",
+                    "user.email=bench@example.com", "-c", "gc.auto=0",
+                    "commit", "-q", "-m", "bench"], cwd=directory, check=True)
+    return files
+
+
+def measure(function) -> float:
+    """Return the best wall time of three runs of function."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Print status times for each tree size and number of changed files."""
+    print(f"{'files':>8} {'changed':>8} {'pathspecs':>10} {'batched':>10} "
+          f"{'full':>10}")
+    working_directory = os.getcwd()
+    for tree_size in TREE_SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            files = make_repo(directory, tree_size)
+            os.chdir(directory)
+            try:
+                git_status = GitStatus()
+                for changed in CHANGED:
+                    # the changed files of a commit are usually close:
+                    # CHANGED_PER_DIRECTORY in consecutive directories
+                    step = FILES_PER_DIRECTORY // CHANGED_PER_DIRECTORY
+                    changed_files = files[:changed * step:step]
+                    for file in changed_files:
+                        with open(file, "a") as file_descriptor:
+                            file_descriptor.write("changed\n")
+                    with open(os.devnull, "w") as devnull, \
+                            redirect_stdout(devnull):
+                        batched = measure(
+                            lambda status=git_status, urls=changed_files:
+                            status.print_short_status_batch(urls))
+                    full = measure(lambda: subprocess.run(
+                        ["git", "status", "-s"], check=True,
+                        stdout=subprocess.DEVNULL))
+                    pathspecs = len(get_pathspecs(changed_files))
+                    print(f"{tree_size:8} {changed:8} {pathspecs:10} "
+                          f"{batched:10.4f} {full:10.4f}")
+            finally:
+                os.chdir(working_directory)
+
+
+if __name__ == "__main__":
+    main()
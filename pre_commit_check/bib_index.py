@@ -0,0 +1,224 @@
+"""a persistent index of the entries of several bib files."""
+
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import re
+from typing import final
+
+from pre_commit_check.file_cache import hash_file
+from pre_commit_check.utilities import get_cache_dir
+
+# one pass over the file: an entry head, then its fields at the top level,
+# each value skipped as a whole so that "title =" inside a note is no field
+ENTRY = re.compile(r"@(?P<type>\w+)\s*[{(]\s*")
+KEY = re.compile(r"(?P<key>[^,\s]+)\s*,")
+FIELD = re.compile(r"\s*(?P<field>[^\s=,{}()\"#]+)\s*=\s*")
+CONCATENATION = re.compile(r"\s*#\s*")
+COMMA = re.compile(r"\s*,")
+BARE_VALUE = re.compile(r"[^,#}()\s]*")
+BRACE = re.compile(r"[{}]")
+QUOTE_OR_BRACE = re.compile(r'[{}"]')
+LATEX_COMMAND = re.compile(r"\\[a-zA-Z]+|\\.")
+NOT_ALNUM = re.compile(r"[\W_]+")
+DOI_PREFIX = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+SKIPPED_TYPES = {"comment", "string", "preamble"}
+VERSION = 3
+
+
+@dataclass(frozen=True)
+class BibEntry:
+    """The location and the identifying fields of a bib entry."""
+
+    key: str
+    file: str
+    line: int
+    doi: str | None
+    title: str | None
+
+    def location(self) -> str:
+        """Return file:line of the entry."""
+        return f"{self.file}:{self.line}"
+
+
+def read_value(text: str, start: int) -> tuple[str, int]:
+    """Return the value part starting at text[start] and its end."""
+    if text.startswith(('{', '"'), start):
+        closing = '}' if text[start] == '{' else '"'
+        end = text.find(closing, start + 1)
+        if end >= 0 and text.find('{', start + 1, end) < 0:
+            # the common case: no nested braces
+            return text[start + 1:end], end + 1
+        depth = 0
+        for token in QUOTE_OR_BRACE.finditer(text, start + 1):
+            if token.group() == '{':
+                depth += 1
+            elif token.group() == '}' and depth > 0:
+                depth -= 1
+            elif token.group() == closing and depth == 0:
+                return text[start + 1:token.start()], token.end()
+        return text[start + 1:], len(text)
+    bare = BARE_VALUE.match(text, start)
+    assert bare is not None  # the pattern matches the empty string
+    return bare.group(), bare.end()
+
+
+def read_field_value(text: str, start: int) -> tuple[str, int]:
+    """Return the value starting at text[start], joined over #, and its
+    end."""
+    value, end = read_value(text, start)
+    while concatenation := CONCATENATION.match(text, end):
+        part, end = read_value(text, concatenation.end())
+        value += part
+    return value, end
+
+
+def normalize_title(title: str) -> str:
+    """Return a hash of title that ignores case, LaTeX markup and punctuation."""
+    words = NOT_ALNUM.sub(" ", LATEX_COMMAND.sub("", title).lower()).split()
+    return hashlib.blake2b(" ".join(words).encode("utf-8"),
+                           digest_size=8).hexdigest()
+
+
+def normalize_doi(doi: str) -> str:
+    """Return doi without resolver prefix, in lower case."""
+    return DOI_PREFIX.sub("", doi.strip()).lower()
+
+
+def parse_bib_text(text: str, file: str) -> list[BibEntry]:
+    """Return the entries of the bib file content text."""
+    entries: list[BibEntry] = []
+    key: str | None = None
+    fields: dict[str, str] = {}
+    line = 1
+    position = 0
+    entry_line = 1
+
+    def add_entry() -> None:
+        if key is not None:
+            entries.append(BibEntry(
+                key=key, file=file, line=entry_line,
+                doi=normalize_doi(fields["doi"]) if fields.get("doi")
+                else None,
+                title=normalize_title(fields["title"]) if fields.get("title")
+                else None))
+
+    while head := ENTRY.search(text, position):
+        add_entry()
+        line += text.count("\n", position, head.start())
+        entry_line = line
+        key = None
+        fields = {}
+        end = head.end()
+        key_match = KEY.match(text, end)
+        if head.group("type").lower() not in SKIPPED_TYPES and key_match:
+            key = key_match.group("key")
+            end = key_match.end()
+            while field := FIELD.match(text, end):
+                value, end = read_field_value(text, field.end())
+                fields.setdefault(field.group("field").lower(), value)
+                comma = COMMA.match(text, end)
+                if comma is None:
+                    break
+                end = comma.end()
+        line += text.count("\n", head.start(), end)
+        position = end
+    add_entry()
+    return entries
+
+
+@final
+class BibIndex:
+    """Keys, DOIs and normalized titles of bib files, kept up to date
+    incrementally by mtime, size and content hash."""
+
+    def __init__(self, path: str | None = None):
+        """Load the index from path."""
+        if path is None:
+            path = os.path.join(get_cache_dir(), "bib_index.json")
+        self.__path = path
+        self.__files: dict[str, dict] = {}
+        self.__entries: dict[str, list[BibEntry]] = {}
+        try:
+            with open(path, "r") as file_descriptor:
+                index = json.load(file_descriptor)
+            if index.get("version") == VERSION:
+                self.__files = index["files"]
+        except (OSError, ValueError):
+            pass
+
+    def update(self, bib_files: set[str]) -> None:
+        """Reparse those bib_files whose content changed."""
+        self.__entries = {}
+        for bib_file in sorted(bib_files):
+            path = os.path.abspath(bib_file)
+            stat = os.stat(path)
+            record = self.__files.get(path)
+            entries = None
+            if record is None or record["mtime_ns"] != stat.st_mtime_ns or \
+                    record["size"] != stat.st_size:
+                sha256 = hash_file(path)
+                if record is None or record["sha256"] != sha256:
+                    with open(path, "r", encoding="utf-8",
+                              errors="replace") as file_descriptor:
+                        entries = parse_bib_text(file_descriptor.read(),
+                                                 bib_file)
+                    record = {"sha256": sha256,
+                              "entries": [[entry.key, entry.line, entry.doi,
+                                           entry.title] for entry in entries]}
+                record = dict(record, mtime_ns=stat.st_mtime_ns,
+                              size=stat.st_size)
+                self.__files[path] = record
+            if entries is None:
+                entries = [BibEntry(key=key, file=bib_file, line=line,
+                                    doi=doi, title=title)
+                           for key, line, doi, title in record["entries"]]
+            self.__entries[bib_file] = entries
+
+        self.__files = {path: record for path, record in self.__files.items()
+                        if os.path.exists(path)}
+
+    def save(self) -> None:
+        """Write the index back to disk."""
+        tmp_path = self.__path + ".tmp"
+        with open(tmp_path, "w") as file_descriptor:
+            file_descriptor.write(json.dumps({"version": VERSION,
+                                              "files": self.__files}))
+        os.replace(tmp_path, self.__path)
+
+    def get_entries(self, bib_file: str) -> list[BibEntry]:
+        """Return the entries of bib_file."""
+        return self.__entries.get(bib_file, [])
+
+    def get_duplicate_keys(self) -> dict[str, list[BibEntry]]:
+        """Return the keys defined more than once across the bib files.
+
+        BibTeX compares keys case-insensitively, so they are grouped by
+        their lower case and reported by their first spelling.
+        """
+        by_key: dict[str, list[BibEntry]] = {}
+        for entries in self.__entries.values():
+            for entry in entries:
+                by_key.setdefault(entry.key.lower(), []).append(entry)
+        return {entries[0].key: entries for entries in by_key.values()
+                if len(entries) > 1}
+
+    def get_likely_duplicates(self) -> list[list[BibEntry]]:
+        """Return groups of entries with different keys but the same DOI
+        or normalized title."""
+        buckets: dict[tuple[str, str], list[BibEntry]] = {}
+        for entries in self.__entries.values():
+            for entry in entries:
+                if entry.doi:
+                    buckets.setdefault(("doi", entry.doi), []).append(entry)
+                if entry.title:
+                    buckets.setdefault(("title", entry.title), []).append(entry)
+
+        groups: dict[frozenset[str], list[BibEntry]] = {}
+        for entries in buckets.values():
+            if len(entries) > 1:
+                keys = frozenset(entry.key for entry in entries)
+                if len(keys) > 1:
+                    groups.setdefault(keys, entries)
+        return list(groups.values())
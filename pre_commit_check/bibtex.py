@@ -6,8 +6,7 @@ import fileinput
 import sys
 from typing import final
 
-import bibtexparser  # type: ignore
-
+from pre_commit_check.bib_index import BibIndex
 from pre_commit_check.lint import Lint
 from pre_commit_check.fls_file import main_fls
 from pre_commit_check.git_status import GitStatusABC
@@ -64,21 +63,36 @@ class BibTeXLint(Lint):
 
     def check_bib_files(self, git_status: GitStatusABC) -> None:
         """Check the git status of the bib files of main.tex."""
-        for bib_file in self.get_bib_files():
-            git_status.print_short_status(bib_file)
+        git_status.print_short_status_batch(sorted(self.get_bib_files()))
 
     @staticmethod
-    def check_citations() -> None:
-        """Check for duplicate bib entries."""
+    def check_citations(index: BibIndex) -> bool:
+        """Check for bib entries that are not cited."""
         citations = BibTeXLint.get_citations()
-        for bib_file in BibTeXLint.get_bib_files():
-            with open(bib_file) as bibtex_file:
-                bib_database = bibtexparser.load(bibtex_file)
-                for entry in bib_database.entries:
-                    if not Citation(entry['ID']) in citations:  # problem
-                        entry_id = entry['ID']
-                        print(f"remove {entry_id:20} from {bib_file}")
-                        sys.exit(-1)
+        unused = False
+        for bib_file in sorted(BibTeXLint.get_bib_files()):
+            for entry in index.get_entries(bib_file):
+                if not Citation(entry.key) in citations:  # problem
+                    print(f"remove {entry.key:20} from {bib_file}")
+                    unused = True
+        return not unused
+
+    @staticmethod
+    def check_duplicates(index: BibIndex) -> bool:
+        """Check for keys defined twice and report likely duplicate entries."""
+        duplicate_keys = index.get_duplicate_keys()
+        for key, entries in sorted(duplicate_keys.items()):
+            locations = ", ".join(entry.location() for entry in entries)
+            print(f"duplicate key {key:20} in {locations}")
+        for entries in index.get_likely_duplicates():
+            locations = ", ".join(f"{entry.key} ({entry.location()})"
+                                  for entry in entries)
+            print(f"likely duplicate entries: {locations}")
+        return not duplicate_keys
+
+    def __init__(self, index_path: str | None = None):
+        """Keep the bib index at index_path (default: in the cache dir)."""
+        self.__index_path = index_path
 
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Lint the bibtex files."""
@@ -87,4 +101,9 @@ class BibTeXLint(Lint):
             sys.exit(1)
 
         self.check_bib_files(git_status)
-        BibTeXLint.check_citations()
+        index = BibIndex(self.__index_path)
+        index.update(BibTeXLint.get_bib_files())
+        index.save()
+        unique = BibTeXLint.check_duplicates(index)
+        if not BibTeXLint.check_citations(index) or not unique:
+            sys.exit(-1)
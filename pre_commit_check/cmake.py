@@ -1,13 +1,14 @@
 """lint using cmake."""
 
 from pathlib import Path
-import os
 import subprocess
 import sys
 from typing import final
 
+from pre_commit_check.compiler_cache import CompilerCache
 from pre_commit_check.lint import Lint
 from pre_commit_check.git_status import GitStatusABC
+from pre_commit_check.output_capture import run_captured
 
 
 @final
@@ -18,13 +19,21 @@ class CMakeLint(Lint):
         """Lint C/C++ code."""
         cmake_lists_file = Path(root + "/CMakeLists.txt")
         if cmake_lists_file.is_file():
-            working_directory = os.getcwd()
-            os.chdir(root)
+            compiler_cache = CompilerCache.find()
+            cmake_args: list[str] = []
+            env = None
+            stats = (0, 0)
+            if compiler_cache is not None:
+                cmake_args = compiler_cache.get_cmake_args()
+                env = compiler_cache.get_env(root)
+                stats = compiler_cache.get_stats()
             try:
-                subprocess.run(["cmake", "."], check=True)
-                subprocess.run(["make"], check=True)
+                run_captured("cmake", ["cmake", *cmake_args, "."], check=True,
+                             cwd=root, env=env)
+                run_captured("cmake-make", ["make"], check=True, cwd=root,
+                             env=env)
             except subprocess.CalledProcessError as error:
                 print(f"cmake failed: {error}")
                 sys.exit(-1)
-
-            os.chdir(working_directory)
+            if compiler_cache is not None:
+                compiler_cache.print_hit_rate(stats)
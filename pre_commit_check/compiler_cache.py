@@ -0,0 +1,171 @@
+"""compiler caches (ccache, sccache) for the native-build lints."""
+
+import json
+import os
+import shlex
+import shutil
+import subprocess
+from typing import final
+
+from pre_commit_check.timeouts import run_command
+from pre_commit_check.utilities import get_cache_dir
+
+LAUNCHERS = ["sccache", "ccache"]
+# the compiler names a Makefile is likely to call, wrapped for make builds
+COMPILERS = ["cc", "c++", "gcc", "g++", "clang", "clang++"]
+
+
+def find_compiler(name: str, path: str, skip: str) -> str | None:
+    """Return the compiler name on path, skipping the directory skip and
+    links to a compiler cache (e.g. ccache's masquerade directory)."""
+    for directory in path.split(os.pathsep):
+        candidate = os.path.join(directory, name)
+        if directory and directory != skip and os.path.isfile(candidate) \
+                and os.access(candidate, os.X_OK) and \
+                os.path.basename(os.path.realpath(candidate)) not in LAUNCHERS:
+            return candidate
+    return None
+
+
+def get_user_compilers() -> list[str]:
+    """Return the first words of CC and CXX from the environment."""
+    compilers = []
+    for name in ("CC", "CXX"):
+        split = shlex.split(os.environ.get(name, ""))
+        if split:
+            compilers.append(split[0])
+    return compilers
+
+
+def write_wrapper(file: str, command: list[str]) -> None:
+    """Write an executable shell script running command with its args."""
+    temporary = f"{file}.{os.getpid()}"
+    with open(temporary, "w") as file_descriptor:
+        file_descriptor.write(f'#!/bin/sh\nexec {shlex.join(command)} "$@"\n')
+    os.chmod(temporary, 0o755)
+    os.replace(temporary, file)
+
+
+def parse_ccache_stats(text: str) -> tuple[int, int]:
+    """Return (hits, misses) from the output of ccache --print-stats."""
+    counters: dict[str, int] = {}
+    for line in text.splitlines():
+        split = line.split('\t')
+        if len(split) == 2 and split[1].isdigit():
+            counters[split[0]] = int(split[1])
+    hits = counters.get("direct_cache_hit", 0) + \
+        counters.get("preprocessed_cache_hit", 0)
+    return hits, counters.get("cache_miss", 0)
+
+
+def parse_sccache_stats(text: str) -> tuple[int, int]:
+    """Return (hits, misses) from sccache --show-stats --stats-format=json."""
+    stats = json.loads(text)["stats"]
+    hits = sum(stats["cache_hits"]["counts"].values())
+    misses = sum(stats["cache_misses"]["counts"].values())
+    return hits, misses
+
+
+@final
+class CompilerCache:
+    """A compiler launcher that caches compilation results."""
+
+    def __init__(self, launcher: str):
+        """Use launcher (ccache or sccache) as the compiler cache."""
+        self.launcher = launcher
+
+    @staticmethod
+    def find() -> "CompilerCache | None":
+        """Return the first compiler cache found on the PATH."""
+        for launcher in LAUNCHERS:
+            if shutil.which(launcher):
+                return CompilerCache(launcher)
+        return None
+
+    def get_env(self, root: str) -> dict[str, str]:
+        """Return the environment for builds under root.
+
+        The cache directory stays at the launcher's persistent per-user
+        default (or CCACHE_DIR/SCCACHE_DIR) so that it is shared by all
+        checkouts; the base dir makes hits independent of the worktree path.
+        """
+        env = dict(os.environ)
+        if self.launcher == "ccache":
+            env.setdefault("CCACHE_BASEDIR", root)
+        return env
+
+    def get_cmake_args(self) -> list[str]:
+        """Return the cmake arguments for the compiler launcher."""
+        return [f"-DCMAKE_{lang}_COMPILER_LAUNCHER={self.launcher}"
+                for lang in ("C", "CXX")]
+
+    def get_make_env(self, root: str,
+                     wrapper_dir: str | None = None) -> dict[str, str] | None:
+        """Return the environment for make builds under root.
+
+        The Makefile keeps its own compiler: wrappers calling the launcher
+        for the COMPILERS and the CC and CXX of the user come first on the
+        PATH. None without a POSIX shell or a compiler to wrap, as the
+        build would be uncached.
+        """
+        launcher = shutil.which(self.launcher)
+        if os.name != "posix" or launcher is None:
+            return None
+        if wrapper_dir is None:
+            wrapper_dir = os.path.join(get_cache_dir(), "compiler_wrappers",
+                                       self.launcher)
+        os.makedirs(wrapper_dir, exist_ok=True)
+        env = self.get_env(root)
+        path = env.get("PATH", os.defpath)
+        wrapped = set()
+        for name in COMPILERS + get_user_compilers():
+            compiler = None if os.path.dirname(name) else \
+                find_compiler(name, path, wrapper_dir)
+            if compiler is not None:
+                write_wrapper(os.path.join(wrapper_dir, name),
+                              [launcher, compiler])
+                wrapped.add(name)
+        for name in set(os.listdir(wrapper_dir)) - wrapped:
+            # a compiler gone from the PATH or from CC/CXX
+            os.remove(os.path.join(wrapper_dir, name))
+        if not wrapped:
+            return None
+        env["PATH"] = wrapper_dir + os.pathsep + path
+        return env
+
+    def get_make_args(self) -> list[str]:
+        """Return the make variables wrapping the CC and CXX of the user.
+
+        Only compilers given by path are wrapped here, the others are
+        found on the PATH as wrappers; make variables on the command line
+        would override those of the Makefile.
+        """
+        args = []
+        for name in ("CC", "CXX"):
+            split = shlex.split(os.environ.get(name, ""))
+            if split and os.path.dirname(split[0]):
+                args.append(f"{name}={self.launcher} {os.environ[name]}")
+        return args
+
+    def get_stats(self) -> tuple[int, int]:
+        """Return the current (hits, misses) counters of the cache."""
+        try:
+            if self.launcher == "ccache":
+                return parse_ccache_stats(run_command(
+                    ["ccache", "--print-stats"], check=True, encoding="utf-8",
+                    stdout=subprocess.PIPE).stdout)
+            return parse_sccache_stats(run_command(
+                ["sccache", "--show-stats", "--stats-format=json"], check=True,
+                encoding="utf-8", stdout=subprocess.PIPE).stdout)
+        except (subprocess.CalledProcessError, ValueError, KeyError):
+            return 0, 0
+
+    def print_hit_rate(self, before: tuple[int, int]) -> None:
+        """Print the hits and misses since the counters were before."""
+        after = self.get_stats()
+        hits = after[0] - before[0]
+        misses = after[1] - before[1]
+        total = hits + misses
+        rate = 100.0 * hits / total if total else 0.0
+        print(f"{self.launcher}: {hits} hits, {misses} misses "
+              f"({rate:.0f}% hit rate)")
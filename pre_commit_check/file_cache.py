@@ -0,0 +1,60 @@
+"""a persistent cache of files that passed a lint, keyed by content hash."""
+
+import hashlib
+import json
+import os
+from typing import final
+
+from pre_commit_check.utilities import get_cache_dir
+
+
+def hash_file(path: str) -> str:
+    """Return the sha256 hex digest of the content of path."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_descriptor:
+        for block in iter(lambda: file_descriptor.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@final
+class FileHashCache:
+    """Remember the content hashes of files that passed a tool."""
+
+    def __init__(self, name: str, fingerprint: str = "",
+                 cache_dir: str | None = None):
+        """Load the cache name from cache_dir.
+
+        The cache is dropped when fingerprint, e.g. the tool version and
+        its configuration, differs from the one it was saved with.
+        """
+        if cache_dir is None:
+            cache_dir = get_cache_dir()
+        self.__path = os.path.join(cache_dir, name + ".json")
+        self.__fingerprint = fingerprint
+        self.__hashes: dict[str, str] = {}
+        try:
+            with open(self.__path, "r") as file_descriptor:
+                cache = json.load(file_descriptor)
+            if cache.get("fingerprint") == fingerprint:
+                self.__hashes = cache["hashes"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            self.__hashes = {}
+
+    def is_clean(self, path: str) -> bool:
+        """Check whether path passed with its current content."""
+        return os.path.isfile(path) and \
+            self.__hashes.get(path) == hash_file(path)
+
+    def mark_clean(self, path: str) -> None:
+        """Record that path passed with its current content."""
+        self.__hashes[path] = hash_file(path)
+
+    def save(self) -> None:
+        """Write the cache back to disk."""
+        tmp_path = self.__path + ".tmp"
+        with open(tmp_path, "w") as file_descriptor:
+            json.dump({"fingerprint": self.__fingerprint,
+                       "hashes": self.__hashes},
+                      file_descriptor, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.__path)
@@ -1,6 +1,7 @@
 """context manager for reading .fls files."""
 
 import collections
+from collections.abc import Iterable
 from contextlib import contextmanager
 from typing import final
 
@@ -38,6 +39,18 @@ class MainFlsLines(collections.abc.Iterator):
                 return line.removeprefix("INPUT ").removesuffix("\n")
 
 
+def read_output_files(lines: Iterable[str]) -> set[str]:
+    """Return the files in the OUTPUT lines of an .fls file."""
+    return {line.removeprefix("OUTPUT ").removesuffix("\n").removeprefix("./")
+            for line in lines if line.startswith("OUTPUT ")}
+
+
+def get_output_files() -> set[str]:
+    """Return the files written by the last latex run according to main.fls."""
+    with open("main.fls", "r") as file_descriptor:
+        return read_output_files(file_descriptor)
+
+
 @contextmanager
 def main_fls():
     """Context manager for main.fls."""
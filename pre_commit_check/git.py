@@ -8,9 +8,9 @@ import sys
 from typing import final
 
 from git import Repo
-import git
 
 from pre_commit_check.utilities import get_root
+from pre_commit_check.timeouts import run_command
 
 REGION = "eu-central-1"
 
@@ -28,9 +28,9 @@ class GitRemoteUrl(GitRemoteUrlABC):
     def get_remote_url(self) -> str:
         """Get git remote url."""
         try:
-            return subprocess.run(["git", "config", "--get",
-                                   "remote.origin.url"], check=True, encoding="utf-8",
-                                  stdout=subprocess.PIPE).stdout.strip()
+            return run_command(["git", "config", "--get",
+                                "remote.origin.url"], check=True, encoding="utf-8",
+                               stdout=subprocess.PIPE).stdout.strip()
         except subprocess.CalledProcessError as error:
             print("git config --get remote.origin.url failed")
             print("Is this really a git repository?")
@@ -47,9 +47,9 @@ def is_github_repo(git_remote_url: GitRemoteUrlABC) -> bool:
 def is_default_branch_main() -> bool:
     """Check if the default branch is main."""
     try:
-        lines = subprocess.run(["git", "remote", "show", "origin"], check=True,
-                               encoding="utf-8",
-                               stdout=subprocess.PIPE).stdout.splitlines()
+        lines = run_command(["git", "remote", "show", "origin"], check=True,
+                            encoding="utf-8",
+                            stdout=subprocess.PIPE).stdout.splitlines()
         for line in lines:
             if "HEAD branch" in line:
                 default = line.split(':')[1].removeprefix(' ')
@@ -92,7 +92,8 @@ class GitWrapper:
     def get_remote_origin_head_sha(self) -> str:
         """Get the remote head commit sha."""
         url = self.get_origin_url()
-        ref = git.cmd.Git().ls_remote(url, heads=True)
+        ref = run_command(["git", "ls-remote", "--heads", url], check=True,
+                          encoding="utf-8", stdout=subprocess.PIPE).stdout
         return ref.split('\t')[0]
 
     def get_nr_of_local_commits(self) -> int:
@@ -1,8 +1,18 @@
 """utilities for the git status of files."""
 
 from abc import ABC, abstractmethod
+import os
+import shutil
 import subprocess
 
+from pre_commit_check.timeouts import run_command
+
+WATCHMAN_HOOK = "hooks/fsmonitor-watchman"
+# git matches every index entry against every pathspec: beyond about 32
+# pathspecs this costs more than a status of the whole tree, so directories
+# are collapsed to their parents to stay well below
+MAX_PATHSPECS = 16
+
 
 class GitStatusABC(ABC):
     """ABC for GitStatus."""
@@ -12,13 +22,141 @@ class GitStatusABC(ABC):
         """Abstract method for printing a git status."""
         pass
 
+    def print_short_status_batch(self, urls: list[str]) -> None:
+        """Print short version of git status for several files."""
+        for url in urls:
+            self.print_short_status(url)
+
+
+def get_git_config(name: str) -> str | None:
+    """Return the value of git config name, None if it is unset."""
+    completed = run_command(["git", "config", "--get", name],
+                            encoding="utf-8", stdout=subprocess.PIPE)
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def has_builtin_fsmonitor() -> bool:
+    """Check whether git has the built-in filesystem monitor daemon."""
+    try:
+        options = run_command(["git", "version", "--build-options"],
+                              check=True, encoding="utf-8",
+                              stdout=subprocess.PIPE).stdout
+    except subprocess.CalledProcessError:
+        return False
+    return "feature: fsmonitor--daemon" in options
+
+
+def get_status_config() -> list[str]:
+    """Return -c options enabling the fsmonitor and the untracked cache.
+
+    Settings made by the user are kept; otherwise the built-in daemon or
+    a watchman hook is used when available.
+    """
+    config: list[str] = []
+    if get_git_config("core.fsmonitor") is None:
+        git_dir = run_command(["git", "rev-parse", "--path-format=absolute",
+                               "--git-dir"], encoding="utf-8",
+                              stdout=subprocess.PIPE).stdout.strip()
+        hook = os.path.join(git_dir, WATCHMAN_HOOK)
+        if has_builtin_fsmonitor():
+            config += ["-c", "core.fsmonitor=true"]
+        elif shutil.which("watchman") and os.access(hook, os.X_OK):
+            config += ["-c", f"core.fsmonitor={hook}"]
+    if get_git_config("core.untrackedCache") is None:
+        config += ["-c", "core.untrackedCache=true"]
+    return config
+
+
+def get_pathspecs(paths: list[str],
+                  max_pathspecs: int = MAX_PATHSPECS) -> list[str]:
+    """Return the directories holding paths; files at the top level stay
+    files so that the untracked scan does not walk the whole tree.
+
+    Beyond max_pathspecs, the deepest directories are replaced by their
+    parents; an empty list, the whole tree, if only the root is left.
+    """
+    specs = {os.path.dirname(path) + "/" if os.path.dirname(path)
+             else path for path in paths}
+    while len(specs) > max_pathspecs:
+        deepest = max((spec.count("/") for spec in specs
+                       if spec.endswith("/")), default=1)
+        if deepest == 1:
+            return []
+        specs = {spec[:spec.rstrip("/").rfind("/") + 1]
+                 if spec.endswith("/") and spec.count("/") == deepest
+                 else spec for spec in specs}
+        directories = [spec for spec in specs if spec.endswith("/")]
+        specs = {spec for spec in specs
+                 if not any(spec != directory and spec.startswith(directory)
+                            for directory in directories)}
+    return sorted(specs)
+
+
+def parse_short_status(output: str) -> list[tuple[str, str]]:
+    """Return (XY, path) from git status -s -z output."""
+    entries: list[tuple[str, str]] = []
+    fields = iter(output.split('\0'))
+    for field in fields:
+        if not field:
+            continue
+        entries.append((field[:2], field[3:]))
+        if 'R' in field[:2] or 'C' in field[:2]:
+            next(fields, None)  # the source of a rename or copy
+    return entries
+
 
 class GitStatus(GitStatusABC):
     """Container for printing the git status of files."""
 
+    def __init__(self):
+        """Detect the fsmonitor and untracked cache settings once."""
+        self.__config = get_status_config()
+        self.__root = run_command(["git", "rev-parse", "--show-toplevel"],
+                                  check=True, encoding="utf-8",
+                                  stdout=subprocess.PIPE).stdout.strip()
+
     def print_short_status(self, url: str) -> None:
         """Print short version of git status."""
+        self.print_short_status_batch([url])
+
+    def print_short_status_batch(self, urls: list[str]) -> None:
+        """Print short version of git status with a single git call.
+
+        The pathspecs restrict the index refresh and the untracked scan
+        to the directories holding urls, collapsed to common parents when
+        there are too many; the whole tree is only checked when they
+        meet at the root, which the fsmonitor keeps cheap.
+        """
+        requested = {}
+        for url in urls:
+            try:
+                relpath = os.path.relpath(os.path.abspath(url), self.__root)
+            except ValueError:
+                # on another drive
+                relpath = os.pardir
+            if relpath.split(os.sep)[0] == os.pardir:
+                print(f"{url} is outside the repository")
+            else:
+                requested[relpath] = url
+        if not requested:
+            return
+        pathspecs = get_pathspecs(list(requested))
         try:
-            subprocess.run(["git", "status", "-s", url], check=True)
+            output = run_command(["git", "-C", self.__root, *self.__config,
+                                  "status", "-s", "-z",
+                                  "--untracked-files=normal", "--",
+                                  *pathspecs],
+                                 check=True, encoding="utf-8",
+                                 stdout=subprocess.PIPE).stdout
         except subprocess.CalledProcessError as error:
             print(f"git status failed {error}")
+            return
+
+        for status, path in parse_short_status(output):
+            if path.endswith('/'):
+                # an untracked directory stands for all files below it
+                for file in sorted(requested):
+                    if file.startswith(path):
+                        print(f"{status} {requested[file]}")
+            elif path in requested:
+                print(f"{status} {requested[path]}")
@@ -1,4 +1,7 @@
 """lints for programming languages: Swift, Rust, Python, Make."""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import json
 import shutil
 import os
 from pathlib import Path
@@ -8,6 +11,17 @@ from typing import final
 
 from pre_commit_check.lint import Lint
 from pre_commit_check.git_status import GitStatusABC
+from pre_commit_check.compiler_cache import CompilerCache
+from pre_commit_check.file_cache import FileHashCache, hash_file
+from pre_commit_check.output_capture import run_captured
+from pre_commit_check.timeouts import run_command
+from pre_commit_check.utilities import get_staged_files, get_cache_dir, chunks
+
+# configuration files whose changes invalidate the cache of a Swift tool
+SWIFT_CONFIGS = {"swiftlint": [".swiftlint.yml"],
+                 "swift-format": [".swift-format"]}
+# the directory linted by the Swift tools, in both modes
+SWIFT_SOURCES = "Sources"
 
 SCRIPTS = ["codecommit-tags.py", "rusage.py", "aws-creds-role.py",
            "precommit-check.py", "git-log.py", "main_log.py"]
@@ -22,8 +36,10 @@ class SwiftLint(Lint):
         """Run swift on the Swift code."""
         if shutil.which("swift"):
             try:
-                subprocess.run(["swift", "package", "clean"], check=True)
-                subprocess.run(
+                run_captured("swift-clean", ["swift", "package", "clean"],
+                             check=True)
+                run_captured(
+                    "swift-build",
                     ["swift", "build", "-Xswiftc", "-warnings-as-errors"],
                     check=True)
             except subprocess.CalledProcessError as error:
@@ -34,31 +50,108 @@ class SwiftLint(Lint):
     def run_swift_lint(root: str) -> None:
         """Run swiftlint on the Swift code."""
         if shutil.which("swiftlint"):
-            working_directory = os.getcwd()
-            os.chdir(root)
             try:
-                subprocess.run(["swiftlint", "lint", "Sources"], check=True)
+                run_captured("swiftlint", ["swiftlint", "lint", SWIFT_SOURCES],
+                             check=True, cwd=root)
             except subprocess.CalledProcessError as error:
                 print(f"swiftlint failed: {error}")
                 sys.exit(-1)
-            os.chdir(working_directory)
 
     @staticmethod
     def run_swift_format(root: str) -> None:
         """Run swift format and lint on the Swift code."""
         if shutil.which("swift-format"):
-            working_directory = os.getcwd()
-            os.chdir(root)
             try:
-                subprocess.run(
-                    ["swift-format", "format", "-i", "-r", "Sources"],
-                    check=True)
-                subprocess.run(
-                    ["swift-format", "lint", "-r", "Sources"], check=True)
+                run_captured(
+                    "swift-format",
+                    ["swift-format", "format", "-i", "-r", SWIFT_SOURCES],
+                    check=True, cwd=root)
+                run_captured(
+                    "swift-format-lint",
+                    ["swift-format", "lint", "-r", SWIFT_SOURCES], check=True,
+                    cwd=root)
             except subprocess.CalledProcessError as error:
                 print(f"swift-format failed: {error}")
                 sys.exit(-1)
-            os.chdir(working_directory)
+
+    @staticmethod
+    def get_fingerprint(root: str, tool: str) -> str:
+        """Return the version of tool and the hashes of its configuration."""
+        try:
+            fingerprint = run_command([tool, "--version"], check=True,
+                                      encoding="utf-8",
+                                      stdout=subprocess.PIPE).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            fingerprint = ""
+        for config in SWIFT_CONFIGS.get(tool, []):
+            path = os.path.join(root, config)
+            if os.path.isfile(path):
+                fingerprint += f"\n{config}:{hash_file(path)}"
+        return fingerprint
+
+    @staticmethod
+    def run_in_chunks(root: str, tool: str, commands: list[list[str]],
+                      files: list[str]) -> None:
+        """Run commands + chunk of files in parallel; skip clean files."""
+        cache = FileHashCache(tool, SwiftLint.get_fingerprint(root, tool))
+        dirty = [file for file in files
+                 if not cache.is_clean(os.path.join(root, file))]
+        if not dirty:
+            return
+
+        def run_chunk(index: int, chunk: list[str]) -> list[str]:
+            for step, command in enumerate(commands):
+                try:
+                    run_captured(f"{tool}-{step}-{index}", command + chunk,
+                                 check=True, cwd=root)
+                except subprocess.CalledProcessError as error:
+                    print(f"{tool} failed: {error}")
+                    return []
+            return chunk
+
+        nr_of_workers = os.cpu_count() or 1
+        file_chunks = chunks(dirty, nr_of_workers)
+        with ThreadPoolExecutor(max_workers=nr_of_workers) as executor:
+            chunk_results = list(executor.map(
+                run_chunk, range(len(file_chunks)), file_chunks))
+
+        for chunk in chunk_results:
+            for file in chunk:
+                cache.mark_clean(os.path.join(root, file))
+        cache.save()
+
+        if sum(len(chunk) for chunk in chunk_results) != len(dirty):
+            sys.exit(-1)
+
+    @staticmethod
+    def get_staged_sources() -> list[str]:
+        """Return the staged Swift files below SWIFT_SOURCES."""
+        return [file for file in get_staged_files(".swift")
+                if file.startswith(SWIFT_SOURCES + "/")]
+
+    @staticmethod
+    def run_swift_lint_staged(root: str, files: list[str]) -> None:
+        """Run swiftlint on the staged Swift files.
+
+        Files given explicitly are only matched against the excluded paths
+        of .swiftlint.yml with --force-exclude.
+        """
+        if shutil.which("swiftlint"):
+            SwiftLint.run_in_chunks(
+                root, "swiftlint",
+                [["swiftlint", "lint", "--quiet", "--force-exclude"]], files)
+
+    @staticmethod
+    def run_swift_format_staged(root: str, files: list[str]) -> None:
+        """Run swift format and lint on the staged Swift files."""
+        if shutil.which("swift-format"):
+            SwiftLint.run_in_chunks(
+                root, "swift-format", [["swift-format", "format", "-i"],
+                                       ["swift-format", "lint"]], files)
+
+    def __init__(self, whole_tree: bool = False):
+        """Lint the whole Sources tree or only the staged files."""
+        self.__whole_tree = whole_tree
 
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Lint Swift code."""
@@ -67,28 +160,164 @@ class SwiftLint(Lint):
             git_status.print_short_status(os.fspath(package_file))
             print("swift repo")
 
-            SwiftLint.run_swift_lint(root)
-            SwiftLint.run_swift_format(root)
+            if self.__whole_tree:
+                SwiftLint.run_swift_lint(root)
+                SwiftLint.run_swift_format(root)
+            else:
+                files = SwiftLint.get_staged_sources()
+                SwiftLint.run_swift_lint_staged(root, files)
+                SwiftLint.run_swift_format_staged(root, files)
             SwiftLint.run_swift(root)
 
 
+@dataclass(frozen=True)
+class ClippyFinding:
+    """A diagnostic reported by cargo clippy."""
+
+    package: str
+    level: str
+    message: str
+    code: str | None
+    file: str | None
+    line: int | None
+    column: int | None
+
+    def __str__(self) -> str:
+        """Format the finding like a compiler diagnostic."""
+        location = f"{self.file}:{self.line}:{self.column}: " if self.file else ""
+        code = f" [{self.code}]" if self.code else ""
+        return f"{location}{self.level}: {self.message}{code} ({self.package})"
+
+
+def parse_clippy_message(line: str,
+                         package_names: dict[str, str]) -> ClippyFinding | None:
+    """Parse one line of cargo --message-format=json output."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if record.get("reason") != "compiler-message":
+        return None
+    message = record["message"]
+    if message["level"] not in ("error", "warning"):
+        return None
+    code = message["code"]["code"] if message.get("code") else None
+    primary = [span for span in message.get("spans", []) if span["is_primary"]]
+    span = primary[0] if primary else None
+    package_id = record["package_id"]
+    return ClippyFinding(package=package_names.get(package_id, package_id),
+                         level=message["level"], message=message["message"],
+                         code=code,
+                         file=span["file_name"] if span else None,
+                         line=span["line_start"] if span else None,
+                         column=span["column_start"] if span else None)
+
+
+def get_affected_packages(metadata: dict, root: str,
+                          staged_files: list[str]) -> set[str] | None:
+    """Return the workspace members affected by staged_files and their
+    dependents; None means the whole workspace is affected."""
+    members = {package["name"]: os.path.dirname(os.path.realpath(
+        package["manifest_path"])) for package in metadata["packages"]
+        if package["id"] in metadata["workspace_members"]}
+    workspace_root = os.path.realpath(metadata["workspace_root"])
+
+    changed: set[str] = set()
+    for file in staged_files:
+        path = os.path.realpath(os.path.join(root, file))
+        owners = [name for name, directory in members.items()
+                  if path.startswith(directory + os.sep)]
+        if owners:
+            changed.add(max(owners, key=lambda name: len(members[name])))
+        elif path.startswith(workspace_root + os.sep) and \
+                (path.endswith(".rs") or os.path.basename(path) in
+                 ("Cargo.toml", "Cargo.lock")):
+            return None
+
+    dependents: dict[str, set[str]] = {name: set() for name in members}
+    for package in metadata["packages"]:
+        if package["name"] not in members:
+            continue
+        for dependency in package["dependencies"]:
+            if dependency["name"] in members:
+                dependents[dependency["name"]].add(package["name"])
+
+    affected: set[str] = set()
+    todo = list(changed)
+    while todo:
+        name = todo.pop()
+        if name not in affected:
+            affected.add(name)
+            todo.extend(dependents[name])
+    return affected
+
+
 @final
 class RustLint(Lint):
     """Lint the Rust code."""
 
+    @staticmethod
+    def get_target_dir() -> str:
+        """Return the CARGO_TARGET_DIR shared across runs and worktrees."""
+        if "CARGO_TARGET_DIR" in os.environ:
+            return os.environ["CARGO_TARGET_DIR"]
+        return os.path.join(get_cache_dir(), "cargo-target")
+
+    @staticmethod
+    def get_metadata(root: str) -> dict:
+        """Run cargo metadata for the workspace at root."""
+        try:
+            return json.loads(run_command(
+                ["cargo", "metadata", "--format-version", "1", "--no-deps"],
+                check=True, cwd=root, encoding="utf-8",
+                stdout=subprocess.PIPE).stdout)
+        except subprocess.CalledProcessError as error:
+            print(f"cargo metadata failed: {error}")
+            sys.exit(-1)
+
+    @staticmethod
+    def run_clippy(root: str, metadata: dict,
+                   packages: set[str] | None) -> None:
+        """Run cargo clippy on packages and print the findings."""
+        command = ["cargo", "clippy", "--message-format=json"]
+        if packages is None:
+            command.append("--workspace")
+        else:
+            for package in sorted(packages):
+                command.extend(["-p", package])
+        command.extend(["--", "-D", "warnings"])
+
+        package_names = {package["id"]: package["name"]
+                         for package in metadata["packages"]}
+        env = dict(os.environ, CARGO_TARGET_DIR=RustLint.get_target_dir())
+        findings: list[ClippyFinding] = []
+
+        def on_line(line: str) -> bool:
+            if not line.startswith('{'):
+                return False
+            finding = parse_clippy_message(line, package_names)
+            if finding is not None:
+                print(finding)
+                findings.append(finding)
+            return True
+
+        completed = run_captured("cargo-clippy", command, on_line=on_line,
+                                 cwd=root, env=env)
+        if completed.returncode != 0 or \
+                any(finding.level == "error" for finding in findings):
+            print(f"cargo clippy failed: {len(findings)} findings")
+            sys.exit(-1)
+
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Run cargo and clippy over Rust code."""
         package_file = Path(root + "/Cargo.toml")
         if package_file.is_file():
             if shutil.which("cargo"):
-                # subprocess.run(["cargo", "clean"])
-                try:
-                    subprocess.run(
-                        ["cargo", "clippy", "--", "-D", "warnings"],
-                        check=True)
-                except subprocess.CalledProcessError as error:
-                    print(f"cargo clippy failed: {error}")
-                    sys.exit(-1)
+                metadata = RustLint.get_metadata(root)
+                packages = get_affected_packages(
+                    metadata, root, get_staged_files("", diff_filter=None))
+                if packages is None or packages:
+                    RustLint.run_clippy(root, metadata, packages)
                 git_status.print_short_status(os.fspath(package_file))
                 print("rust repo")
 
@@ -99,8 +328,7 @@ class PythonLint(Lint):
 
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Check for python scripts."""
-        for script in SCRIPTS:
-            git_status.print_short_status(script)
+        git_status.print_short_status_batch(SCRIPTS)
 
 
 @final
@@ -111,12 +339,27 @@ class MakeLint(Lint):
         """Run make on MakeFiles."""
         package_file = Path(root + "/code/Makefile")
         if package_file.is_file():
-            working_directory = os.getcwd()
-            os.chdir(root + "/code")
+            code_directory = root + "/code"
+            compiler_cache = CompilerCache.find()
+            make_args: list[str] = []
+            env = None
+            stats = (0, 0)
+            if compiler_cache is not None:
+                env = compiler_cache.get_make_env(root)
+                if env is None:
+                    print(f"make: cannot wrap the compilers with "
+                          f"{compiler_cache.launcher}, the build is uncached")
+                    compiler_cache = None
+            if compiler_cache is not None:
+                make_args = compiler_cache.get_make_args()
+                stats = compiler_cache.get_stats()
             try:
-                subprocess.run(["make", "clean"], check=True)
-                subprocess.run(["make"], check=True)
+                run_captured("make-clean", ["make", "clean"], check=True,
+                             cwd=code_directory)
+                run_captured("make", ["make", *make_args], check=True,
+                             cwd=code_directory, env=env)
             except subprocess.CalledProcessError as error:
                 print(f"make failed: {error}")
                 sys.exit(-1)
-            os.chdir(working_directory)
+            if compiler_cache is not None:
+                compiler_cache.print_hit_rate(stats)
@@ -22,8 +22,7 @@ class LaTexLint(Lint):
                 files.append(line.removeprefix("./"))
         input_files: list[str] = sorted(set(files))
 
-        for file in input_files:
-            git_status.print_short_status(file)
+        git_status.print_short_status_batch(input_files)
 
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Run the latex lint: check for input files."""
@@ -8,6 +8,13 @@ from pre_commit_check.git_status import GitStatusABC
 class Lint(ABC):
     """Base class for lints."""
 
+    # lints that are not required are skipped when they time out
+    required: bool = True
+    # seconds the subprocesses of the lint may take; None means no limit
+    timeout: float | None = None
+    # the output of cacheable lints depends only on the LaTeX build
+    cacheable: bool = False
+
     @abstractmethod
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Abstract function for running lints."""
@@ -11,6 +11,9 @@ from pre_commit_check.git import GitWrapper
 class LocalGit(Lint):
     """Lint local git."""
 
+    required = False
+    timeout = 30.0
+
     # git rev-parse origin/HEAD # to get the latest commit on the remote
 
     # git rev-parse HEAD          # to get the latest commit on the local
@@ -0,0 +1,133 @@
+"""scanner for the warnings in main.log."""
+
+from dataclasses import dataclass
+import mmap
+import os
+import re
+from typing import final
+
+from pre_commit_check.lint import Lint
+from pre_commit_check.git_status import GitStatusABC
+
+# warnings are anchored at the start of a line so that their parentheses
+# are consumed before the file nesting alternatives can see them. The
+# anchor is a newline rather than ^ and the parentheses carry no outer
+# group: both keep the fast literal prefix scan of the regex engine.
+LOG_PATTERN = re.compile(rb"""
+  \n(?=[OULMP])(?:
+    (?P<box>(?:Overfull|Underfull)\ \\[hv]box\ [^\n]*?
+       (?:lines?\ (?P<box_line>\d+)[^\n]*)?)$
+  | (?P<reference>LaTeX\ Warning:\ (?:Reference|Citation)\ `[^']*'[^\n]*)$
+  | (?P<character>Missing\ character:\ There\ is\ no\ [^\n]*)$
+  | (?P<rerun>(?:LaTeX|Package\ [\w-]+)\ Warning:[^\n]*Rerun[^\n]*
+       |Package\ rerunfilecheck\ Warning:[^\n]*)$)
+| \((?P<file>[^\s(){}<>]+)?
+| \)
+""", re.MULTILINE | re.VERBOSE)
+REFERENCE_LINE = re.compile(rb"undefined\s+on\s+input\s+line\s+(\d+)")
+FILE_NAME = re.compile(rb"[^\s(){}<>]*")
+EXTENSION = re.compile(rb"\.\w+$")
+# TeX breaks the lines of the log after max_print_line characters
+MAX_PRINT_LINE = 79
+
+CLOSE = ord(')')
+
+KINDS = {"box": "box", "reference": "undefined reference",
+         "character": "missing character", "rerun": "rerun"}
+
+
+@dataclass(frozen=True)
+class LogFinding:
+    """A warning in main.log mapped to its source file and line."""
+
+    kind: str
+    message: str
+    file: str | None
+    line: int | None
+
+    def __str__(self) -> str:
+        """Format the finding like a compiler diagnostic."""
+        location = self.file or "main.log"
+        if self.line is not None:
+            location += f":{self.line}"
+        return f"{location}: {self.kind}: {self.message}"
+
+
+def get_continuation(buffer, end: int) -> bytes:
+    """Return the line after end if TeX wrapped the line ending at end."""
+    if end - (buffer.rfind(b"\n", 0, end) + 1) != MAX_PRINT_LINE or \
+            buffer[end:end + 1] != b"\n":
+        return b""
+    next_end = buffer.find(b"\n", end + 1)
+    return buffer[end + 1:next_end if next_end != -1 else len(buffer)]
+
+
+def get_file_name(buffer, match: re.Match) -> bytes | None:
+    """Return the file opened by match, joined with its wrapped rest."""
+    name = match.group("file")
+    if name is None:
+        return None
+    rest = FILE_NAME.match(get_continuation(buffer, match.end()))
+    if rest and rest.group() and \
+            not os.path.isfile(name.decode("utf-8", "replace")):
+        name += rest.group()
+    return name if EXTENSION.search(name) else None
+
+
+def scan_buffer(buffer) -> list[LogFinding]:
+    """Scan the bytes of a LaTeX log for warnings."""
+    findings: list[LogFinding] = []
+    # the file in effect at each open parenthesis
+    stack: list[bytes | None] = []
+    current: bytes | None = None
+    for match in LOG_PATTERN.finditer(buffer):
+        group = match.lastgroup
+        if group is None or group == "file":
+            if buffer[match.start()] == CLOSE:
+                if stack:
+                    current = stack.pop()
+            else:
+                stack.append(current)
+                current = get_file_name(buffer, match) or current
+            continue
+        message = match.group(group)
+        line = match.group("box_line")
+        if group == "reference":
+            message = (message + get_continuation(buffer, match.end())) \
+                .replace(b"\n", b"")
+            reference_line = REFERENCE_LINE.search(message)
+            line = reference_line.group(1) if reference_line else None
+        findings.append(LogFinding(
+            kind=KINDS[group],
+            message=message.decode("utf-8", "replace"),
+            file=current.decode("utf-8", "replace").removeprefix("./")
+            if current else None,
+            line=int(line) if line else None))
+    return findings
+
+
+def scan_log(path: str) -> list[LogFinding]:
+    """Scan the LaTeX log at path without decoding it into lines."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return []
+    with open(path, "rb") as file_descriptor:
+        with mmap.mmap(file_descriptor.fileno(), 0,
+                       access=mmap.ACCESS_READ) as buffer:
+            return scan_buffer(buffer)
+
+
+def print_log_findings(path: str) -> None:
+    """Print the warnings of the LaTeX log at path."""
+    for finding in scan_log(path):
+        print(finding)
+
+
+@final
+class MainLogLint(Lint):
+    """Report the warnings in main.log."""
+
+    cacheable = True
+
+    def run(self, root: str, git_status: GitStatusABC) -> None:
+        """Print the boxes, undefined references and rerun warnings."""
+        print_log_findings("main.log")
@@ -12,6 +12,8 @@ from pre_commit_check.git_status import GitStatusABC
 class MissingLabelsLint(Lint):
     """Lint labels."""
 
+    cacheable = True
+
     def run(self, root: str, git_status: GitStatusABC) -> None:
         """Find labels that were defined but not reference."""
         labels = set()
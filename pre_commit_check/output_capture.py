@@ -0,0 +1,75 @@
+"""bounded capture of the output of the tools run by the lints."""
+
+from collections import deque
+from collections.abc import Callable
+import os
+import subprocess
+import time
+
+from pre_commit_check.timeouts import stream_command
+from pre_commit_check.utilities import get_cache_dir
+
+TAIL_LINES = 40
+# longer lines are split, so that memory stays bounded without newlines;
+# lines for on_line stay whole and are only cut short in the ring buffer
+MAX_LINE_BYTES = 1 << 16
+
+
+def get_log_path(tool: str, log_dir: str | None = None) -> str:
+    """Return the path of the full log of tool."""
+    if log_dir is None:
+        log_dir = os.path.join(get_cache_dir(), "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    return os.path.join(log_dir, f"{tool}.log")
+
+
+def run_captured(tool: str, args: list[str], check: bool = False,
+                 on_line: Callable[[str], bool] | None = None,
+                 log_dir: str | None = None,
+                 **kwargs) -> subprocess.CompletedProcess:
+    """Run args with stdout and stderr kept in a ring buffer and a log file.
+
+    On success one summary line is printed, on failure the last
+    TAIL_LINES lines. Lines for which on_line returns True are consumed
+    by the caller and kept out of the ring buffer.
+    """
+    log_path = get_log_path(tool, log_dir)
+    tail: deque[str] = deque(maxlen=TAIL_LINES)
+    nr_of_lines = 0
+    start = time.monotonic()
+    try:
+        with open(log_path, "wb") as log, \
+                stream_command(args, stdout=subprocess.PIPE,
+                               stderr=subprocess.STDOUT, **kwargs) as process:
+            assert process.stdout is not None
+            stdout = process.stdout
+            limit = MAX_LINE_BYTES if on_line is None else -1
+            for raw_line in iter(lambda: stdout.readline(limit), b""):
+                log.write(raw_line)
+                nr_of_lines += 1
+                line = raw_line.decode("utf-8", "replace")
+                if on_line is None or not on_line(line):
+                    tail.append(line[:MAX_LINE_BYTES])
+    except subprocess.TimeoutExpired:
+        print_tail(tool, tail, log_path)
+        print(f"{tool}: timed out after {time.monotonic() - start:.1f}s")
+        raise
+
+    elapsed = time.monotonic() - start
+    if process.returncode != 0:
+        print_tail(tool, tail, log_path)
+        print(f"{tool}: failed with exit code {process.returncode} "
+              f"({nr_of_lines} lines, {elapsed:.1f}s)")
+        if check:
+            raise subprocess.CalledProcessError(process.returncode, args)
+    else:
+        print(f"{tool}: ok ({nr_of_lines} lines, {elapsed:.1f}s, "
+              f"log: {log_path})")
+    return subprocess.CompletedProcess(args, process.returncode)
+
+
+def print_tail(tool: str, tail: deque[str], log_path: str) -> None:
+    """Print the last lines of the output of tool."""
+    print(f"{tool}: last {len(tail)} lines of {log_path}:")
+    for line in tail:
+        print(f"  {line}", end="" if line.endswith("\n") else "\n")
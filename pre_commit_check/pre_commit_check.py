@@ -9,6 +9,9 @@ __version__ = '0.1'
 __author__ = "T. Schütt <schuett@gmail.com>"
 __doc__ = "Lints the main.tex file before a git commit"
 
+import argparse
+from contextlib import nullcontext, redirect_stdout
+import io
 import logging
 import os
 import shutil
@@ -18,12 +21,23 @@ import sys
 from pre_commit_check.bibtex import BibTeXLint
 from pre_commit_check.git import is_default_branch_main
 from pre_commit_check.local_git import LocalGit
-from pre_commit_check.utilities import get_root
+from pre_commit_check.utilities import get_root, get_cache_dir
 from pre_commit_check.languages import SwiftLint, RustLint, PythonLint, MakeLint
 from pre_commit_check.latex import LaTexLint
 from pre_commit_check.missing_labels import MissingLabelsLint
 from pre_commit_check.cmake import CMakeLint
 from pre_commit_check.git_status import GitStatus
+from pre_commit_check.lint import Lint
+from pre_commit_check.log_file import MainLogLint, print_log_findings
+from pre_commit_check.output_capture import run_captured
+from pre_commit_check.profiling import Profiler
+from pre_commit_check.remote_cache import RemoteCache
+from pre_commit_check.timeouts import (
+    is_budget_exhausted,
+    lint_deadline,
+    parse_duration,
+    set_budget
+)
 
 log = logging.getLogger(__name__)
 
@@ -60,36 +74,134 @@ def primary_checks() -> int:
     return 0
 
 
-def main() -> int:
-    """Define the main function."""
-    if primary_checks() != 0:
-        return 1
+def parse_args(argv: list[str] | None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=parse_duration, default=None,
+                        help="deadline for the whole run, e.g. 60s or 2m")
+    parser.add_argument("--lint-timeout", type=parse_duration, default=None,
+                        help="default timeout for the subprocesses of a lint")
+    parser.add_argument("--remote-cache", metavar="URL",
+                        default=os.environ.get("PRE_COMMIT_CHECK_REMOTE_CACHE"),
+                        help="HTTP server caching the LaTeX build outputs")
+    parser.add_argument("--profile", nargs='?', const="", default=None,
+                        metavar="DIR",
+                        help="write a cProfile profile of each lint to DIR")
+    parser.add_argument("--swift-whole-tree", action="store_true",
+                        help="lint all of Sources instead of the staged "
+                        "Swift files")
+    return parser.parse_args(argv)
+
+
+def run_lint(lint: Lint, root: str, git_status: GitStatus,
+             verdicts: dict[str, str]) -> None:
+    """Run lint; replay or record the output of cacheable lints."""
+    name = type(lint).__name__
+    if not lint.cacheable:
+        lint.run(root, git_status)
+    elif name in verdicts:
+        print(verdicts[name], end="")
+    else:
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                lint.run(root, git_status)
+            verdicts[name] = output.getvalue()
+        finally:
+            print(output.getvalue(), end="")
+
+
+def print_cut_short(cut_short: list[str]) -> None:
+    """Print the lints that were cut short by timeouts."""
+    if cut_short:
+        print(f"cut short by timeouts: {', '.join(cut_short)}")
+
+
+def run_lints(lints: list[Lint], root: str, git_status: GitStatus,
+              lint_timeout: float | None, profiler: Profiler | None,
+              verdicts: dict[str, str]) -> int:
+    """Run the lints within their timeouts and summarize the skipped ones."""
+    cut_short: list[str] = []
+    for lint in lints:
+        name = type(lint).__name__
+        try:
+            if is_budget_exhausted():
+                raise subprocess.TimeoutExpired(name, 0.0)
+            timeout = lint.timeout if lint.timeout is not None else lint_timeout
+            with lint_deadline(timeout), \
+                    profiler.profile(name) if profiler else nullcontext():
+                run_lint(lint, root, git_status, verdicts)
+        except subprocess.TimeoutExpired:
+            cut_short.append(name)
+            if lint.required:
+                print(f"{name} timed out")
+                print_cut_short(cut_short)
+                return 1
+            print(f"{name}: skipped (timeout)")
+
+    print_cut_short(cut_short)
+    return 0
+
 
+def build() -> int:
+    """Build main.pdf from scratch with latexmk."""
     try:
-        subprocess.run(["latexmk", "-C"], check=True)
+        run_captured("latexmk-clean", ["latexmk", "-C"], check=True)
     except subprocess.CalledProcessError as error:
         print(f"latexmk -C failed: {error}")
         return 1
 
     try:
-        subprocess.run(["latexmk", "-time", "-pdf",
-                        "-interaction=nonstopmode",
-                        "-Werror", "-logfilewarninglist", "main"],
-                       check=True)
+        run_captured("latexmk", ["latexmk", "-time", "-pdf",
+                                 "-interaction=nonstopmode",
+                                 "-Werror", "-logfilewarninglist", "main"],
+                     check=True)
     except subprocess.CalledProcessError as error:
+        print_log_findings("main.log")
         print(f"latexmk failed; please check main.log: {error}")
         return 1
+    return 0
 
-    root = get_root()
-    git_status = GitStatus()
 
-    lints = [PythonLint(), LaTexLint(), BibTeXLint(), SwiftLint(), RustLint(),
-             LocalGit(), MakeLint(), CMakeLint(), MissingLabelsLint()]
-    for lint in lints:
-        lint.run(root, git_status)
+def main(argv: list[str] | None = None) -> int:
+    """Define the main function."""
+    args = parse_args(argv)
+    set_budget(args.budget)
 
+    remote_cache = None
+    cached_verdicts = None
+    try:
+        if primary_checks() != 0:
+            return 1
+
+        if args.remote_cache:
+            remote_cache = RemoteCache(args.remote_cache)
+            cached_verdicts = remote_cache.pull()
+        if cached_verdicts is None and build() != 0:
+            return 1
+
+        root = get_root()
+        git_status = GitStatus()
+
+        lints = [PythonLint(), LaTexLint(), BibTeXLint(),
+                 SwiftLint(args.swift_whole_tree), RustLint(),
+                 LocalGit(), MakeLint(), CMakeLint(), MissingLabelsLint(),
+                 MainLogLint()]
+        profiler = None
+        if args.profile is not None:
+            profiler = Profiler(args.profile or
+                                os.path.join(get_cache_dir(), "profile"))
+        verdicts = dict(cached_verdicts or {})
+        if run_lints(lints, root, git_status, args.lint_timeout, profiler,
+                     verdicts) != 0:
+            return 1
+
+        if remote_cache is not None and cached_verdicts is None:
+            remote_cache.push(verdicts)
+    except subprocess.TimeoutExpired as error:
+        print(f"budget exceeded: {error}")
+        return 1
     return 0
 
-
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,92 @@
+"""profiling of the lints with cProfile."""
+
+from contextlib import contextmanager
+import cProfile
+import os
+import pstats
+from typing import final
+
+# a function as keyed by pstats: (file name, line number, function name)
+Function = tuple[str, int, str]
+
+MAX_DEPTH = 100
+MIN_SECONDS = 1e-6
+
+
+def get_label(function: Function) -> str:
+    """Return a short label of function for a collapsed stack."""
+    file_name, line, name = function
+    if file_name == "~":
+        return name.replace(';', ',')
+    return f"{os.path.basename(file_name)}:{line}({name})".replace(';', ',')
+
+
+def get_collapsed_stacks(stats: dict) -> dict[str, float]:
+    """Return the seconds spent in each call stack of pstats stats.
+
+    cProfile only records caller/callee edges, so the self time of a
+    function is split among its call paths in proportion to the
+    cumulative time of the edges.
+    """
+    children: dict[Function, list[tuple[Function, float]]] = {}
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((function, edge[3]))
+
+    stacks: dict[str, float] = {}
+
+    def walk(function: Function, path: list[Function], seconds: float) -> None:
+        total = stats[function][3]
+        fraction = seconds / total if total else 0.0
+        key = ";".join(get_label(entry) for entry in path)
+        stacks[key] = stacks.get(key, 0.0) + stats[function][2] * fraction
+        if len(path) >= MAX_DEPTH:
+            return
+        for child, edge_seconds in children.get(function, []):
+            child_seconds = edge_seconds * fraction
+            if child not in path and child_seconds >= MIN_SECONDS:
+                walk(child, path + [child], child_seconds)
+
+    for function, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            walk(function, [function], cumulative)
+    return stacks
+
+
+@final
+class Profiler:
+    """Profile named sections and write pstats and collapsed stacks."""
+
+    def __init__(self, directory: str, top: int = 10):
+        """Write the profiles to directory and print top functions."""
+        self.__directory = directory
+        self.__top = top
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def profile(self, name: str):
+        """Profile the code within the context as name."""
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.write(name, profile)
+
+    def write(self, name: str, profile: cProfile.Profile) -> None:
+        """Write name.pstats and name.collapsed, and print the hot spots."""
+        path = os.path.join(self.__directory, name)
+        profile.dump_stats(path + ".pstats")
+        stats = pstats.Stats(profile).stats  # type: ignore
+        with open(path + ".collapsed", "w") as file_descriptor:
+            for stack, seconds in sorted(get_collapsed_stacks(stats).items()):
+                microseconds = round(seconds * 1e6)
+                if microseconds > 0:
+                    file_descriptor.write(f"{stack} {microseconds}\n")
+
+        hot = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        print(f"profile {name}: {path}.pstats")
+        for function, (_, calls, own, cumulative, _) in hot[:self.__top]:
+            print(f"  {own:8.4f}s {cumulative:8.4f}s {calls:8} "
+                  f"{get_label(function)}")
@@ -0,0 +1,236 @@
+"""a team-shared remote cache for LaTeX build outputs and lint verdicts."""
+
+import hashlib
+import io
+import json
+import os
+import subprocess
+import tarfile
+from typing import final
+import urllib.error
+import urllib.request
+
+from pre_commit_check.bibtex import BibTeXLint
+from pre_commit_check.file_cache import hash_file
+from pre_commit_check.fls_file import (main_fls, get_output_files,
+                                       read_output_files)
+from pre_commit_check.timeouts import get_timeout, run_command
+
+# written by bibtex and latexmk, so they are missing from OUTPUT in main.fls
+EXTRA_OUTPUTS = ["main.fls", "main.bbl", "main.blg", "main.fdb_latexmk"]
+VERDICTS = "verdicts.json"
+DEFAULT_TIMEOUT = 30.0
+
+
+def get_toolchain_version() -> str:
+    """Return the versions of latexmk and pdflatex."""
+    versions = []
+    for command in (["latexmk", "-v"], ["pdflatex", "--version"]):
+        try:
+            versions.append(run_command(command, check=True, encoding="utf-8",
+                                        stdout=subprocess.PIPE).stdout.strip())
+        except (OSError, subprocess.CalledProcessError):
+            versions.append("")
+    return "\n".join(versions)
+
+
+def get_portable_name(file: str) -> str | None:
+    """Name an absolute input the same on every machine, None if unable.
+
+    Inputs under the home directory (e.g. a personal ~/texmf tree) are named
+    relative to it; other absolute inputs belong to the TeX distribution and
+    are covered by the toolchain version.
+    """
+    home = os.path.expanduser("~")
+    relpath = os.path.relpath(file, home)
+    if relpath.startswith(os.pardir):
+        return None
+    return os.path.join("~", relpath)
+
+
+def get_local_manifest() -> list[str] | None:
+    """Return the inputs of the last local build, or None without a build."""
+    if not os.path.exists("main.fls"):
+        return None
+    outputs = get_output_files()
+    inputs: set[str] = set()
+    with main_fls() as fls_file:
+        for line in fls_file:
+            file = line.removeprefix("./")
+            if file in outputs or file.endswith(".bbl"):
+                continue
+            name = get_portable_name(file) if os.path.isabs(file) else file
+            if name is not None:
+                inputs.add(name)
+    if os.path.exists("main.blg"):
+        inputs |= BibTeXLint.get_bib_files()
+    return sorted(inputs)
+
+
+def is_safe_output(file: str) -> bool:
+    """Check that file stays in the current directory and outside .git."""
+    if os.path.isabs(file) or {"..", ".git"} & set(file.split('/')):
+        return False
+    real_path = os.path.realpath(file)
+    relpath = os.path.relpath(real_path, os.path.realpath(os.curdir))
+    parts = relpath.split(os.sep)
+    return parts[0] != os.pardir and ".git" not in parts
+
+
+def get_tracked_files(files: list[str]) -> set[str]:
+    """Return the files among files that git tracks."""
+    if not files:
+        return set()
+    try:
+        output = run_command(["git", "ls-files", "-z", "--", *files],
+                             check=True, encoding="utf-8",
+                             stdout=subprocess.PIPE).stdout
+    except subprocess.CalledProcessError as error:
+        raise ValueError(f"git ls-files failed: {error}") from error
+    return {file for file in output.split('\0') if file}
+
+
+def get_request_timeout() -> float | None:
+    """Return the timeout of a request, None if the budget is used up."""
+    timeout = get_timeout()
+    if timeout is None:
+        return DEFAULT_TIMEOUT
+    return timeout if timeout > 0 else None
+
+
+def get_build_key(manifest: list[str], toolchain: str) -> str | None:
+    """Hash the toolchain and the content of the inputs in manifest."""
+    digest = hashlib.sha256(toolchain.encode("utf-8"))
+    for file in sorted(manifest):
+        path = os.path.expanduser(file)
+        if not os.path.isfile(path):
+            return None
+        digest.update(f"\0{file}\0{hash_file(path)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+@final
+class RemoteCache:
+    """Store LaTeX builds on a server speaking HTTP GET and PUT."""
+
+    def __init__(self, url: str):
+        """Use the server at url."""
+        self.__url = url.rstrip('/')
+        self.__toolchain = get_toolchain_version()
+
+    def get(self, path: str) -> bytes | None:
+        """Download path; None if it is missing or the server fails."""
+        timeout = get_request_timeout()
+        if timeout is None:
+            print(f"remote cache: GET {path} skipped, budget exceeded")
+            return None
+        try:
+            with urllib.request.urlopen(f"{self.__url}/{path}",
+                                        timeout=timeout) as response:
+                return response.read()
+        except urllib.error.HTTPError as error:
+            if error.code != 404:
+                print(f"remote cache: GET {path} failed: {error}")
+        except OSError as error:
+            print(f"remote cache: GET {path} failed: {error}")
+        return None
+
+    def put(self, path: str, data: bytes) -> None:
+        """Upload data as path."""
+        request = urllib.request.Request(f"{self.__url}/{path}", data=data,
+                                         method="PUT")
+        timeout = get_request_timeout()
+        if timeout is None:
+            print(f"remote cache: PUT {path} skipped, budget exceeded")
+            return
+        try:
+            with urllib.request.urlopen(request, timeout=timeout):
+                pass
+        except OSError as error:
+            print(f"remote cache: PUT {path} failed: {error}")
+
+    def get_manifest_key(self) -> str:
+        """Return the key of the manifest of main.tex."""
+        digest = hashlib.sha256(self.__toolchain.encode("utf-8"))
+        digest.update(hash_file("main.tex").encode("utf-8"))
+        return digest.hexdigest()
+
+    def pull(self) -> dict[str, str] | None:
+        """Restore the build outputs; return the verdicts on a hit."""
+        manifests = []
+        data = self.get(f"manifest/{self.get_manifest_key()}")
+        if data is not None:
+            try:
+                manifest = json.loads(data)
+                if not isinstance(manifest, list):
+                    raise ValueError("not a list of files")
+                manifests.append(manifest)
+            except ValueError as error:
+                print(f"remote cache: ignoring bad manifest: {error}")
+        local_manifest = get_local_manifest()
+        if local_manifest is not None:
+            manifests.append(local_manifest)
+
+        for manifest in manifests:
+            key = get_build_key(manifest, self.__toolchain)
+            data = self.get(f"build/{key}") if key else None
+            if data is None:
+                continue
+            try:
+                return self.extract(key, data)
+            except (tarfile.TarError, KeyError, ValueError) as error:
+                print(f"remote cache: ignoring bad build {key}: {error}")
+        return None
+
+    @staticmethod
+    def extract(key: str | None, data: bytes) -> dict[str, str]:
+        """Unpack the build outputs in data and return its verdicts.
+
+        The payload comes from a shared server, so only the outputs named
+        by its main.fls and EXTRA_OUTPUTS are written, and never outside
+        the current directory, below .git or over a file git tracks.
+        """
+        with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+            verdicts_file = archive.extractfile(VERDICTS)
+            if verdicts_file is None:
+                raise KeyError(f"{VERDICTS} is not a file")
+            verdicts = json.load(verdicts_file)
+            allowed = set(EXTRA_OUTPUTS)
+            if "main.fls" in archive.getnames():
+                fls_file = archive.extractfile("main.fls")
+                if fls_file is not None:
+                    allowed |= read_output_files(
+                        io.TextIOWrapper(fls_file, encoding="utf-8"))
+            members = [member for member in archive.getmembers()
+                       if member.isfile() and member.name in allowed
+                       and is_safe_output(member.name)]
+            tracked = get_tracked_files([member.name for member in members])
+            members = [member for member in members
+                       if member.name not in tracked]
+            archive.extractall(members=members)
+        print(f"remote cache: hit {key}")
+        return verdicts
+
+    def push(self, verdicts: dict[str, str]) -> None:
+        """Upload the build outputs of main.tex and the verdicts."""
+        manifest = get_local_manifest()
+        key = get_build_key(manifest, self.__toolchain) if manifest else None
+        if key is None:
+            return
+
+        outputs = sorted(file for file in
+                         get_output_files() | set(EXTRA_OUTPUTS)
+                         if os.path.isfile(file) and not os.path.isabs(file))
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for file in outputs:
+                archive.add(file)
+            data = json.dumps(verdicts).encode("utf-8")
+            info = tarfile.TarInfo(VERDICTS)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+        self.put(f"build/{key}", buffer.getvalue())
+        self.put(f"manifest/{self.get_manifest_key()}",
+                 json.dumps(manifest).encode("utf-8"))
+        print(f"remote cache: pushed {key}")
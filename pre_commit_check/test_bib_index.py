@@ -0,0 +1,100 @@
+"""tests for the bib_index module."""
+
+import os
+import tempfile
+
+from pre_commit_check.bib_index import (
+    BibIndex,
+    normalize_title,
+    parse_bib_text
+)
+from pre_commit_check.test_utilities import mock_file
+
+MAIN_BIB_CONTENT = """@string{omp = "OpenMP"}
+
+@manual{openmp51,
+    author = "{OpenMP Forum}",
+    title  = "OpenMP 5.1 Specification",
+    year   = 2020
+}
+
+@article{smith2020,
+    title = {A {Fast} Method for \\emph{Things}},
+    booktitle = {Not the title},
+    doi = {https://doi.org/10.1000/XYZ},
+}
+"""
+
+OTHER_BIB_CONTENT = """@article{Smith:2020,
+    title = "A fast method for things.",
+    doi = "10.1000/xyz"
+}
+
+@manual{openmp51,
+    title = "OpenMP 5.1",
+}
+"""
+
+
+def test_parse_bib_text():
+    """test the keys and lines of the parsed entries."""
+    entries = parse_bib_text(MAIN_BIB_CONTENT, "main.bib")
+    assert [(entry.key, entry.line) for entry in entries] == [
+        ("openmp51", 3), ("smith2020", 9)]
+    assert entries[1].doi == "10.1000/xyz"
+
+
+def test_parse_bib_text_nested_fields():
+    """test that title and doi inside other field values are skipped."""
+    entries = parse_bib_text(
+        '@article{a,\n  note = {see also, title = z},\n'
+        '  title = "The " # {Real} # " Title",\n}\n'
+        '@article{b, note={x, doi = 10.1/a}, title={Other}}\n'
+        '@article{c, title = "A {"}quoted{"} title", doi = 10.1/c}\n',
+        "main.bib")
+    assert [(entry.key, entry.line) for entry in entries] == [
+        ("a", 1), ("b", 5), ("c", 6)]
+    assert entries[0].title == normalize_title("The Real Title")
+    assert entries[1].doi is None
+    assert entries[1].title == normalize_title("Other")
+    assert entries[2].title == normalize_title('A "quoted" title')
+    assert entries[2].doi == "10.1/c"
+
+
+def test_bib_index():
+    """test duplicate detection across bib files and incremental updates."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bib_index.json")
+        with mock_file("main.bib", MAIN_BIB_CONTENT), \
+                mock_file("other.bib", OTHER_BIB_CONTENT):
+            index = BibIndex(path)
+            index.update({"main.bib", "other.bib"})
+            index.save()
+
+            duplicate_keys = index.get_duplicate_keys()
+            assert list(duplicate_keys) == ["openmp51"]
+            assert [entry.location() for entry in
+                    duplicate_keys["openmp51"]] == ["main.bib:3",
+                                                    "other.bib:6"]
+            groups = index.get_likely_duplicates()
+            assert [sorted(entry.key for entry in group)
+                    for group in groups] == [["Smith:2020", "smith2020"]]
+
+            reloaded = BibIndex(path)
+            reloaded.update({"main.bib"})
+            assert len(reloaded.get_entries("main.bib")) == 2
+            assert reloaded.get_duplicate_keys() == {}
+
+
+def test_duplicate_keys_ignore_case():
+    """test that keys differing only in case are duplicates."""
+    with tempfile.TemporaryDirectory() as directory:
+        with mock_file("main.bib", "@book{Knuth84,\n  title = {A}\n}\n"), \
+                mock_file("other.bib", "@book{knuth84,\n  title = {B}\n}\n"):
+            index = BibIndex(os.path.join(directory, "bib_index.json"))
+            index.update({"main.bib", "other.bib"})
+            duplicate_keys = index.get_duplicate_keys()
+            assert len(duplicate_keys) == 1
+            assert sorted(entry.key for entry in
+                          next(iter(duplicate_keys.values()))) == [
+                              "Knuth84", "knuth84"]
@@ -1,5 +1,8 @@
 """tests for the bibtex module."""
 
+import os
+import tempfile
+
 from pre_commit_check.bibtex import BibTeXLint
 from pre_commit_check.test_utilities import mock_file
 from pre_commit_check.utilities import get_root
@@ -47,11 +50,14 @@ def test_get_bib_files():
 def test_check_bib_files():
     git_status_mock = GitStatusMock()
     root = get_root()
-    with mock_file("main.aux", MAIN_AUX_CONTENT):
+    with mock_file("main.aux", MAIN_AUX_CONTENT), \
+            tempfile.TemporaryDirectory() as directory:
         with mock_file("main.fls", MAIN_FLS_CONTENT):
             with mock_file("main.blg", MAIN_BLG_CONTENT):
                 with mock_file("main.bib", MAIN_BIB_CONTENT):
-                    bib_tex_lint = BibTeXLint()
+                    index_path = os.path.join(directory, "bib_index.json")
+                    bib_tex_lint = BibTeXLint(index_path)
                     bib_tex_lint.run(root, git_status_mock)
+                    assert os.path.exists(index_path)
 
     assert git_status_mock.get_counter() == 1
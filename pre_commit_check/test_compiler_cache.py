@@ -0,0 +1,81 @@
+"""tests for the compiler_cache module."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+from pre_commit_check.compiler_cache import (
+    CompilerCache,
+    write_wrapper,
+    parse_ccache_stats,
+    parse_sccache_stats
+)
+from pre_commit_check.test_decorators import skipIfWindows
+
+CCACHE_STATS = """stats_updated_timestamp\t1697000000
+direct_cache_hit\t7
+preprocessed_cache_hit\t2
+cache_miss\t3
+"""
+
+SCCACHE_STATS = """{"stats": {"cache_hits": {"counts": {"C/C++": 4}},
+ "cache_misses": {"counts": {"C/C++": 1, "Rust": 1}}}}"""
+
+
+def test_parse_ccache_stats():
+    """test summing the direct and preprocessed hits of ccache."""
+    assert parse_ccache_stats(CCACHE_STATS) == (9, 3)
+
+
+def test_parse_sccache_stats():
+    """test summing the hits and misses of all languages of sccache."""
+    assert parse_sccache_stats(SCCACHE_STATS) == (4, 2)
+
+
+def test_launcher_args():
+    """test the launcher arguments for cmake and make."""
+    compiler_cache = CompilerCache("ccache")
+    assert compiler_cache.get_cmake_args() == [
+        "-DCMAKE_C_COMPILER_LAUNCHER=ccache",
+        "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache"]
+    environ = dict(os.environ)
+    try:
+        os.environ.pop("CC", None)
+        os.environ["CXX"] = "/usr/bin/g++-13 -m64"
+        assert compiler_cache.get_make_args() == [
+            "CXX=ccache /usr/bin/g++-13 -m64"]
+        # found on the PATH as a wrapper
+        os.environ["CXX"] = "g++-13"
+        assert compiler_cache.get_make_args() == []
+    finally:
+        os.environ.clear()
+        os.environ.update(environ)
+
+
+@skipIfWindows
+def test_make_env_wrappers():
+    """test that the compilers of a Makefile run through the launcher."""
+    environ = dict(os.environ)
+    with tempfile.TemporaryDirectory() as directory:
+        bin_dir = os.path.join(directory, "bin")
+        wrapper_dir = os.path.join(directory, "wrappers")
+        os.mkdir(bin_dir)
+        echo = shutil.which("echo") or "/bin/echo"
+        write_wrapper(os.path.join(bin_dir, "ccache"), [echo, "ccache"])
+        write_wrapper(os.path.join(bin_dir, "cc"), [echo, "cc"])
+        try:
+            os.environ["PATH"] = bin_dir
+            os.environ.pop("CC", None)
+            os.environ.pop("CXX", None)
+            env = CompilerCache("ccache").get_make_env(directory, wrapper_dir)
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+        assert env is not None
+        assert env["PATH"] == wrapper_dir + os.pathsep + bin_dir
+        assert os.listdir(wrapper_dir) == ["cc"]
+        output = subprocess.run(["cc", "-c", "main.c"], env=env, check=True,
+                                encoding="utf-8",
+                                stdout=subprocess.PIPE).stdout
+        assert output == f"ccache {os.path.join(bin_dir, 'cc')} -c main.c\n"
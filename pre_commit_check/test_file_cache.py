@@ -0,0 +1,32 @@
+"""tests for the file_cache module."""
+
+import tempfile
+
+from pre_commit_check.file_cache import FileHashCache
+from pre_commit_check.test_utilities import mock_file
+
+
+def test_file_hash_cache():
+    """test that FileHashCache forgets files whose content changed."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with mock_file("main.swift", "let x = 1\n"):
+            cache = FileHashCache("swiftlint", "0.52", cache_dir)
+            assert cache.is_clean("main.swift") is False
+            cache.mark_clean("main.swift")
+            cache.save()
+            assert FileHashCache("swiftlint", "0.52", cache_dir).is_clean(
+                "main.swift") is True
+        with mock_file("main.swift", "let x = 2\n"):
+            assert FileHashCache("swiftlint", "0.52", cache_dir).is_clean(
+                "main.swift") is False
+
+
+def test_file_hash_cache_fingerprint():
+    """test that FileHashCache is dropped when the tool or config changes."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with mock_file("main.swift", "let x = 1\n"):
+            cache = FileHashCache("swiftlint", "0.52", cache_dir)
+            cache.mark_clean("main.swift")
+            cache.save()
+            assert FileHashCache("swiftlint", "0.53", cache_dir).is_clean(
+                "main.swift") is False
@@ -1,6 +1,14 @@
-"""Mock class for testing print_short_status."""
+"""Mock class for testing print_short_status and tests for GitStatus."""
 
-from pre_commit_check.git_status import GitStatusABC
+import os
+import subprocess
+import tempfile
+
+from pre_commit_check.git_status import (
+    GitStatusABC,
+    GitStatus,
+    get_pathspecs
+)
 
 
 class GitStatusMock(GitStatusABC):
@@ -14,3 +22,34 @@ class GitStatusMock(GitStatusABC):
 
     def get_counter(self) -> int:
         return self.__counter
+
+
+def test_print_short_status_batch(capfd):
+    """test one git status call for several files in a scratch repo."""
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory, \
+            tempfile.TemporaryDirectory() as outside:
+        outside_file = os.path.join(outside, "d.tex")
+        os.chdir(directory)
+        try:
+            subprocess.run(["git", "init", "-q"], check=True)
+            for name in ("a.tex", "b.tex", "c.tex", outside_file):
+                with open(name, "w") as file_descriptor:
+                    file_descriptor.write(name)
+            GitStatus().print_short_status_batch(["a.tex", outside_file,
+                                                  "b.tex"])
+        finally:
+            os.chdir(working_directory)
+    out = capfd.readouterr().out
+    assert "?? a.tex" in out
+    assert "?? b.tex" in out
+    assert "c.tex" not in out
+    assert f"{outside_file} is outside the repository" in out
+
+
+def test_get_pathspecs():
+    """test collapsing many directories to their common parents."""
+    paths = ["main.tex", "a/x/1.tex", "a/y/2.tex", "a/y/3.tex", "b/4.tex"]
+    assert get_pathspecs(paths) == ["a/x/", "a/y/", "b/", "main.tex"]
+    assert get_pathspecs(paths, 3) == ["a/", "b/", "main.tex"]
+    assert get_pathspecs(paths, 2) == []
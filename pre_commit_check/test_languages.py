@@ -0,0 +1,54 @@
+"""tests for the languages module."""
+
+import json
+
+from pre_commit_check.languages import (
+    get_affected_packages,
+    parse_clippy_message
+)
+
+METADATA = {
+    "workspace_root": "/ws",
+    "workspace_members": ["core 0.1.0", "app 0.1.0", "other 0.1.0"],
+    "packages": [
+        {"name": "core", "id": "core 0.1.0",
+         "manifest_path": "/ws/crates/core/Cargo.toml", "dependencies": []},
+        {"name": "app", "id": "app 0.1.0",
+         "manifest_path": "/ws/crates/app/Cargo.toml",
+         "dependencies": [{"name": "core", "path": "/ws/crates/core"}]},
+        {"name": "other", "id": "other 0.1.0",
+         "manifest_path": "/ws/crates/other/Cargo.toml",
+         "dependencies": [{"name": "serde"}]},
+    ]
+}
+
+
+def test_get_affected_packages():
+    """test mapping staged files to workspace members and dependents."""
+    assert get_affected_packages(
+        METADATA, "/ws", ["crates/core/src/lib.rs"]) == {"core", "app"}
+    assert get_affected_packages(
+        METADATA, "/ws", ["crates/other/src/lib.rs"]) == {"other"}
+    assert get_affected_packages(METADATA, "/ws", ["main.tex"]) == set()
+    # a deleted file, or the source of a move, still affects its package
+    assert get_affected_packages(
+        METADATA, "/ws", ["crates/core/src/deleted.rs",
+                          "crates/other/src/moved.rs"]) == \
+        {"core", "app", "other"}
+    assert get_affected_packages(METADATA, "/ws", ["Cargo.lock"]) is None
+
+
+def test_parse_clippy_message():
+    """test parsing a compiler message of cargo --message-format=json."""
+    line = json.dumps({
+        "reason": "compiler-message", "package_id": "core 0.1.0",
+        "message": {"level": "warning", "message": "unused variable",
+                    "code": {"code": "unused_variables"},
+                    "spans": [{"is_primary": True, "file_name": "src/lib.rs",
+                               "line_start": 3, "column_start": 9}]}})
+    finding = parse_clippy_message(line, {"core 0.1.0": "core"})
+    assert finding is not None
+    assert str(finding) == \
+        "src/lib.rs:3:9: warning: unused variable [unused_variables] (core)"
+    assert parse_clippy_message('{"reason": "build-finished"}', {}) is None
+    assert parse_clippy_message("Compiling core", {}) is None
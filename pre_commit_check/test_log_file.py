@@ -0,0 +1,75 @@
+"""tests for the log_file module."""
+
+from pre_commit_check.log_file import scan_log
+from pre_commit_check.test_utilities import mock_file
+
+MAIN_LOG_CONTENT = """This is pdfTeX, Version 3.141592653-2.6-1.40.25
+(./main.tex
+LaTeX2e <2022-11-01>
+(/usr/share/texlive/texmf-dist/tex/latex/base/article.cls
+Document Class: article 2022/07/02 v1.4n Standard LaTeX document class
+(/usr/share/texlive/texmf-dist/tex/latex/base/size10.clo
+File: size10.clo 2022/07/02 v1.4n Standard LaTeX file (size option)
+))
+(./intro.tex
+Overfull \\hbox (12.34pt too wide) in paragraph at lines 10--12
+[]\\T1/cmr/m/n/10 text (in parens)
+ []
+
+
+LaTeX Warning: Reference `fig:missing' on page 1 undefined on input line 17.
+
+)
+Missing character: There is no ^^A in font cmr10!
+
+LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.
+
+)
+"""
+
+LONG_DIRECTORY = "./chapters/" + "a-long-directory-name/" * 3
+
+# TeX wraps the log after 79 characters, even within words and file names
+WRAPPED_LOG_CONTENT = (
+    "(./main.tex\n"
+    f"({LONG_DIRECTORY}s\n"
+    "ection.tex\n"
+    "LaTeX Warning: Reference `sec:a-rather-long-label-name-for-testing' "
+    "on page 12 \n"
+    "undefined on input line 345.\n"
+    "\n"
+    ")\n"
+    "(./intro.tex)\n"
+    ")\n")
+
+
+def test_scan_log():
+    """test that warnings are mapped to the file in effect."""
+    with mock_file("main.log", MAIN_LOG_CONTENT):
+        findings = scan_log("main.log")
+    assert [(finding.kind, finding.file, finding.line)
+            for finding in findings] == [
+        ("box", "intro.tex", 10),
+        ("undefined reference", "intro.tex", 17),
+        ("missing character", "main.tex", None),
+        ("rerun", "main.tex", None)]
+    assert str(findings[0]).startswith("intro.tex:10: box: Overfull")
+
+
+def test_scan_wrapped_log():
+    """test warnings and file names continued on the next line."""
+    assert len(WRAPPED_LOG_CONTENT.splitlines()[1]) == 79
+    assert len(WRAPPED_LOG_CONTENT.splitlines()[3]) == 79
+    with mock_file("main.log", WRAPPED_LOG_CONTENT):
+        findings = scan_log("main.log")
+    assert [(finding.kind, finding.file, finding.line)
+            for finding in findings] == [
+        ("undefined reference", LONG_DIRECTORY[2:] + "section.tex", 345)]
+    assert findings[0].message.endswith("on page 12 undefined on input "
+                                        "line 345.")
+
+
+def test_scan_empty_log():
+    """test that an empty log has no findings."""
+    with mock_file("main.log", ""):
+        assert scan_log("main.log") == []
@@ -0,0 +1,78 @@
+"""tests for the output_capture module."""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from pre_commit_check.output_capture import (
+    run_captured,
+    MAX_LINE_BYTES,
+    TAIL_LINES
+)
+
+CHATTY = "for index in range(10000): print(f'line {index}')"
+
+
+def test_run_captured_success(capsys):
+    """test that a successful tool prints one summary line."""
+    with tempfile.TemporaryDirectory() as log_dir:
+        completed = run_captured("chatty", [sys.executable, "-c", CHATTY],
+                                 log_dir=log_dir)
+        with open(os.path.join(log_dir, "chatty.log")) as log:
+            assert len(log.readlines()) == 10000
+    assert completed.returncode == 0
+    out = capsys.readouterr().out
+    assert out.startswith("chatty: ok (10000 lines")
+    assert len(out.splitlines()) == 1
+
+
+def test_run_captured_failure(capsys):
+    """test that a failing tool prints the tail of its output."""
+    with tempfile.TemporaryDirectory() as log_dir:
+        try:
+            run_captured("chatty", [sys.executable, "-c",
+                                    CHATTY + "\nraise SystemExit(2)"],
+                         check=True, log_dir=log_dir)
+            assert False
+        except subprocess.CalledProcessError as error:
+            assert error.returncode == 2
+    lines = capsys.readouterr().out.splitlines()
+    assert "  line 9999" in lines
+    assert "  line 9999" == lines[-2]
+    assert len([line for line in lines if line.startswith("  line")]) == \
+        TAIL_LINES
+
+
+def test_run_captured_on_line(capsys):
+    """test that lines consumed by on_line stay out of the tail."""
+    seen = []
+
+    def on_line(line: str) -> bool:
+        seen.append(line)
+        return line.startswith('{')
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        run_captured("json", [sys.executable, "-c",
+                              "print('{}'); print('text'); exit(1)"],
+                     on_line=on_line, log_dir=log_dir)
+    out = capsys.readouterr().out
+    assert seen == ["{}\n", "text\n"]
+    assert "  text" in out
+    assert "  {}" not in out
+
+
+def test_run_captured_long_line():
+    """test that on_line gets a line longer than MAX_LINE_BYTES whole."""
+    seen = []
+
+    def on_line(line: str) -> bool:
+        seen.append(line)
+        return True
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        run_captured("json", [sys.executable, "-c",
+                              f"print('{{' + 'x' * {MAX_LINE_BYTES} + '}}')"],
+                     on_line=on_line, log_dir=log_dir)
+    assert len(seen) == 1
+    assert len(seen[0]) == MAX_LINE_BYTES + 3
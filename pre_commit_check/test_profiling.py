@@ -0,0 +1,25 @@
+"""tests for the profiling module."""
+
+import os
+import tempfile
+
+from pre_commit_check.profiling import Profiler
+
+
+def busy() -> int:
+    """Burn some cycles."""
+    return sum(index * index for index in range(20000))
+
+
+def test_profiler():
+    """test that a profile writes pstats and collapsed stacks."""
+    with tempfile.TemporaryDirectory() as directory:
+        profiler = Profiler(directory, top=3)
+        with profiler.profile("BusyLint"):
+            busy()
+        assert os.path.isfile(os.path.join(directory, "BusyLint.pstats"))
+        with open(os.path.join(directory, "BusyLint.collapsed")) as collapsed:
+            stacks = collapsed.read().splitlines()
+        assert any("(busy)" in stack for stack in stacks)
+        for stack in stacks:
+            assert int(stack.rsplit(' ', 1)[1]) > 0
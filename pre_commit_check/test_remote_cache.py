@@ -0,0 +1,174 @@
+"""tests for the remote_cache module with a local stand-in server."""
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import os
+import subprocess
+import tarfile
+import tempfile
+import threading
+
+from pre_commit_check.remote_cache import RemoteCache
+from pre_commit_check.timeouts import set_budget
+from pre_commit_check.test_utilities import mock_file
+
+MAIN_TEX_CONTENT = """
+\\documentclass{article}
+\\begin{document}
+\\input{intro}
+\\end{document}
+"""
+
+INTRO_TEX_CONTENT = """
+hi
+"""
+
+MAIN_FLS_CONTENT = """PWD /tmp
+INPUT /usr/local/texlive/2023/texmf-dist/tex/latex/base/article.cls
+INPUT ./main.tex
+INPUT ./intro.tex
+INPUT ./main.aux
+OUTPUT main.aux
+OUTPUT main.pdf
+"""
+
+
+class CacheHandler(BaseHTTPRequestHandler):
+    """Store PUT bodies in memory and serve them on GET."""
+
+    store: dict[str, bytes] = {}
+
+    def do_GET(self):
+        """Serve a stored body or 404."""
+        data = self.store.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_PUT(self):
+        """Store the body under the path."""
+        length = int(self.headers["Content-Length"])
+        self.store[self.path] = self.rfile.read(length)
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, _format, *args):
+        """Keep the test output quiet."""
+
+
+@contextmanager
+def cache_server():
+    """Run a stand-in cache server on a free port."""
+    CacheHandler.store = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CacheHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_remote_cache_round_trip():
+    """test that a pushed build is restored by a pull."""
+    with cache_server() as url:
+        with mock_file("main.tex", MAIN_TEX_CONTENT), \
+                mock_file("intro.tex", INTRO_TEX_CONTENT):
+            with mock_file("main.fls", MAIN_FLS_CONTENT), \
+                    mock_file("main.aux", "\\relax\n"), \
+                    mock_file("main.pdf", "%PDF-1.5\n"):
+                remote_cache = RemoteCache(url)
+                assert remote_cache.pull() is None
+                remote_cache.push({"MissingLabelsLint": ""})
+
+            # a fresh checkout: only the sources are present
+            assert not os.path.exists("main.pdf")
+            try:
+                verdicts = RemoteCache(url).pull()
+                assert verdicts == {"MissingLabelsLint": ""}
+                with open("main.pdf") as pdf:
+                    assert pdf.read() == "%PDF-1.5\n"
+                assert os.path.exists("main.fls")
+            finally:
+                for file in ("main.pdf", "main.aux", "main.fls"):
+                    if os.path.exists(file):
+                        os.remove(file)
+
+        with mock_file("main.tex", MAIN_TEX_CONTENT), \
+                mock_file("intro.tex", "changed\n"):
+            assert RemoteCache(url).pull() is None
+
+
+def test_remote_cache_bad_payload(capsys):
+    """test that a corrupt build is a miss with a warning."""
+    with cache_server() as url:
+        with mock_file("main.tex", MAIN_TEX_CONTENT), \
+                mock_file("intro.tex", INTRO_TEX_CONTENT), \
+                mock_file("main.fls", MAIN_FLS_CONTENT), \
+                mock_file("main.aux", "\\relax\n"), \
+                mock_file("main.pdf", "%PDF-1.5\n"):
+            remote_cache = RemoteCache(url)
+            remote_cache.push({"MissingLabelsLint": ""})
+            for path in CacheHandler.store:
+                if path.startswith("/build/"):
+                    CacheHandler.store[path] = b"not a tarball"
+                else:
+                    CacheHandler.store[path] = b"{not json"
+            capsys.readouterr()
+            assert remote_cache.pull() is None
+            output = capsys.readouterr().out
+            assert "ignoring bad manifest" in output
+            assert "ignoring bad build" in output
+
+
+def test_remote_cache_extract_only_outputs():
+    """test that a crafted build cannot write sources or git hooks."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in (
+                ("verdicts.json", b"{}"),
+                ("main.fls", b"OUTPUT main.pdf\nOUTPUT main.tex\n"
+                             b"OUTPUT .git/hooks/pre-commit\n"),
+                ("main.pdf", b"%PDF-1.5\n"),
+                ("main.tex", b"evil\n"),
+                ("evil.sh", b"evil\n"),
+                (".git/hooks/pre-commit", b"evil\n")):
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            subprocess.run(["git", "init", "-q"], check=True)
+            with open("main.tex", "w") as file_descriptor:
+                file_descriptor.write("good\n")
+            subprocess.run(["git", "add", "main.tex"], check=True)
+            assert RemoteCache.extract("key", buffer.getvalue()) == {}
+            assert os.path.exists("main.pdf")
+            assert not os.path.exists("evil.sh")
+            assert not os.path.exists(".git/hooks/pre-commit")
+            with open("main.tex") as file_descriptor:
+                assert file_descriptor.read() == "good\n"
+        finally:
+            os.chdir(working_directory)
+
+
+def test_remote_cache_budget_exceeded(capsys):
+    """test that no request is made once the budget is used up."""
+    with cache_server() as url:
+        remote_cache = RemoteCache(url)
+        set_budget(0.0)
+        try:
+            assert remote_cache.get("build/key") is None
+        finally:
+            set_budget(None)
+    assert "skipped, budget exceeded" in capsys.readouterr().out
@@ -0,0 +1,88 @@
+"""tests for the timeouts module."""
+
+import subprocess
+import sys
+import time
+
+from pre_commit_check.timeouts import (
+    lint_deadline,
+    parse_duration,
+    run_command,
+    stream_command
+)
+from pre_commit_check.git_status import GitStatusABC
+from pre_commit_check.lint import Lint
+from pre_commit_check.pre_commit_check import run_lints
+from pre_commit_check.test_decorators import skipIfWindows
+from pre_commit_check.test_git_status import GitStatusMock
+
+
+def test_parse_duration():
+    """test parsing durations with and without unit."""
+    assert parse_duration("60s") == 60.0
+    assert parse_duration("2m") == 120.0
+    assert parse_duration("90") == 90.0
+
+
+@skipIfWindows
+def test_run_command_timeout():
+    """test that the whole process group is killed on timeout."""
+    start = time.monotonic()
+    try:
+        with lint_deadline(0.2):
+            run_command(["sh", "-c", "sleep 10 & sleep 10"],
+                        stdout=subprocess.PIPE)
+        assert False
+    except subprocess.TimeoutExpired:
+        pass
+    assert time.monotonic() - start < 5.0
+
+
+@skipIfWindows
+def test_stream_command_timeout():
+    """test that a streamed command is killed at the deadline."""
+    start = time.monotonic()
+    try:
+        with lint_deadline(0.2):
+            with stream_command(["sh", "-c", "echo hi; sleep 10"],
+                                encoding="utf-8",
+                                stdout=subprocess.PIPE) as process:
+                assert process.stdout is not None
+                lines = list(process.stdout)
+        assert False
+    except subprocess.TimeoutExpired:
+        pass
+    assert lines == ["hi\n"]
+    assert time.monotonic() - start < 5.0
+
+
+def test_run_command():
+    """test that run_command behaves like subprocess.run."""
+    with lint_deadline(10.0):
+        completed = run_command(["echo", "hi"], check=True, encoding="utf-8",
+                                stdout=subprocess.PIPE)
+    assert completed.stdout == "hi\n"
+
+
+class SleepLint(Lint):
+    """A lint that sleeps longer than its timeout."""
+
+    timeout = 0.1
+
+    def __init__(self, required: bool):
+        """Set whether the lint is required."""
+        self.required = required
+
+    def run(self, root: str, git_status: GitStatusABC) -> None:
+        """Sleep in a subprocess."""
+        run_command([sys.executable, "-c", "import time; time.sleep(10)"])
+
+
+def test_run_lints_summary(capsys):
+    """test that the summary names skipped lints when a required one
+    times out."""
+    lints: list[Lint] = [SleepLint(False), SleepLint(True)]
+    assert run_lints(lints, ".", GitStatusMock(), None, None, {}) == 1
+    out = capsys.readouterr().out
+    assert "SleepLint: skipped (timeout)" in out
+    assert "cut short by timeouts: SleepLint, SleepLint" in out
@@ -3,6 +3,8 @@
 from contextlib import contextmanager
 import os
 
+from pre_commit_check.utilities import chunks
+
 
 @contextmanager
 def mock_file(name: str, content: str):
@@ -15,6 +17,14 @@ def mock_file(name: str, content: str):
         os.remove(name)
 
 
+def test_chunks():
+    """test that chunks splits items into at most n similar lists."""
+    assert chunks(["a", "b", "c", "d", "e"], 2) == [["a", "c", "e"],
+                                                     ["b", "d"]]
+    assert chunks(["a", "b"], 8) == [["a"], ["b"]]
+    assert chunks([], 4) == []
+
+
 # @contextlib.contextmanager
 # def log_time_in_scope(action_name):
 #    log_time('start', action_name)
@@ -0,0 +1,125 @@
+"""time budget and timeouts for the subprocesses of the lints."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+import os
+import signal
+import subprocess
+import threading
+import time
+
+UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+# absolute time.monotonic() deadlines; None means no limit
+_run_deadline: float | None = None
+_lint_deadline: float | None = None
+
+
+def parse_duration(text: str) -> float:
+    """Parse a duration like 90, 60s, 2m or 1.5h into seconds."""
+    text = text.strip()
+    unit = UNITS.get(text[-1:], None)
+    if unit is None:
+        return float(text)
+    return float(text[:-1]) * unit
+
+
+def set_budget(seconds: float | None) -> None:
+    """Set the deadline of the whole run to seconds from now."""
+    global _run_deadline
+    _run_deadline = None if seconds is None else time.monotonic() + seconds
+
+
+@contextmanager
+def lint_deadline(seconds: float | None):
+    """Limit the subprocesses started within the context to seconds."""
+    global _lint_deadline
+    previous = _lint_deadline
+    _lint_deadline = None if seconds is None else time.monotonic() + seconds
+    try:
+        yield
+    finally:
+        _lint_deadline = previous
+
+
+def get_timeout() -> float | None:
+    """Return the seconds left before the nearest deadline."""
+    deadlines = [deadline for deadline in (_run_deadline, _lint_deadline)
+                 if deadline is not None]
+    if not deadlines:
+        return None
+    return max(0.0, min(deadlines) - time.monotonic())
+
+
+def is_budget_exhausted() -> bool:
+    """Check whether the run-level deadline has passed."""
+    return _run_deadline is not None and time.monotonic() >= _run_deadline
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """Kill process and every process it started."""
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+
+
+def run_command(args: list[str], check: bool = False,
+                **kwargs) -> subprocess.CompletedProcess:
+    """Run args like subprocess.run, but within the current deadlines.
+
+    The command runs in its own process group, which is killed as a whole
+    on timeout or interrupt; subprocess.TimeoutExpired is raised then.
+    """
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    timeout = get_timeout()
+    with subprocess.Popen(args, start_new_session=os.name == "posix",
+                          **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            kill_process_group(process)
+            process.communicate()
+            raise
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args,
+                                            stdout, stderr)
+    return subprocess.CompletedProcess(args, process.returncode,
+                                       stdout, stderr)
+
+
+@contextmanager
+def stream_command(args: list[str], **kwargs) -> Iterator[subprocess.Popen]:
+    """Start args like subprocess.Popen, but within the current deadlines.
+
+    The process group is killed when the deadline passes while the caller
+    is still reading; subprocess.TimeoutExpired is raised then.
+    """
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    timeout = get_timeout()
+    with subprocess.Popen(args, start_new_session=os.name == "posix",
+                          **kwargs) as process:
+        timed_out = threading.Event()
+
+        def expire() -> None:
+            timed_out.set()
+            kill_process_group(process)
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, expire)
+            timer.start()
+        try:
+            yield process
+            process.wait()
+        except BaseException:
+            kill_process_group(process)
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout or 0.0)
@@ -1,20 +1,69 @@
 """get the root of the git checkout."""
 
 from functools import cache       # 3.9
+import os
 import subprocess
 import sys
 
+from pre_commit_check.timeouts import run_command
+
 
 @cache
 def get_root() -> str:
     """Return the root path of the git repository."""
     try:
-        return subprocess.run(["git", "rev-parse",
-                               "--show-toplevel"],
-                              check=True, encoding="utf-8",
-                              stdout=subprocess.PIPE).stdout.strip()
+        return run_command(["git", "rev-parse",
+                            "--show-toplevel"],
+                           check=True, encoding="utf-8",
+                           stdout=subprocess.PIPE).stdout.strip()
     except subprocess.CalledProcessError as error:
         print("git rev-parse --show-toplevel failed")
         print("Is this really a git repository?")
         print(error)
         sys.exit(-1)
+
+
+@cache
+def get_cache_dir() -> str:
+    """Return the cache directory shared by all worktrees of the repository."""
+    try:
+        common_dir = run_command(["git", "rev-parse", "--path-format=absolute",
+                                  "--git-common-dir"],
+                                 check=True, encoding="utf-8",
+                                 stdout=subprocess.PIPE).stdout.strip()
+    except subprocess.CalledProcessError as error:
+        print("git rev-parse --git-common-dir failed")
+        print("Is this really a git repository?")
+        print(error)
+        sys.exit(-1)
+    cache_dir = os.path.join(common_dir, "pre_commit_check")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def get_staged_files(suffix: str,
+                     diff_filter: str | None = "ACMR") -> list[str]:
+    """Return the staged files ending with suffix, relative to the root.
+
+    With diff_filter None, deleted files and both sides of renames are
+    included as well.
+    """
+    command = ["git", "diff", "--cached", "--name-only", "-z"]
+    if diff_filter is None:
+        command.append("--no-renames")
+    else:
+        command.append(f"--diff-filter={diff_filter}")
+    try:
+        lines = run_command(command, check=True, encoding="utf-8",
+                            stdout=subprocess.PIPE).stdout.split('\0')
+    except subprocess.CalledProcessError as error:
+        print(f"git diff --cached failed: {error}")
+        sys.exit(-1)
+    return sorted(line for line in lines if line and line.endswith(suffix))
+
+
+def chunks(items: list[str], nr_of_chunks: int) -> list[list[str]]:
+    """Split items into at most nr_of_chunks lists of similar size."""
+    nr_of_chunks = max(1, min(nr_of_chunks, len(items)))
+    return [items[index::nr_of_chunks] for index in range(nr_of_chunks)
+            if items[index::nr_of_chunks]]